@@ -0,0 +1,142 @@
+import sys
+import io
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "preprocess"))
+
+from data_preprocess import DataPreprocessor, ChunkedPreprocessor
+
+
+def make_dataset(n_rows=200_000, n_numeric=20, n_categorical=5, seed=42):
+    rng = np.random.default_rng(seed)
+    data = {f"num_{i}": rng.lognormal(size=n_rows) for i in range(n_numeric)}
+    for i in range(n_categorical):
+        data[f"cat_{i}"] = rng.choice([f"level_{j}" for j in range(5)], size=n_rows)
+    df = pd.DataFrame(data)
+    mask = rng.random((n_rows, n_numeric)) < 0.02
+    df.iloc[:, :n_numeric] = df.iloc[:, :n_numeric].mask(mask)
+    df["target"] = rng.integers(0, 2, n_rows)
+    return df
+
+
+def make_config(df):
+    numeric_cols = [col for col in df.columns if col.startswith("num_")]
+    categorical_cols = [col for col in df.columns if col.startswith("cat_")]
+    return {
+        "imputation": {"mean": numeric_cols},
+        "outlier": {"method": "iqr", "action": "cap", "columns": numeric_cols},
+        "rare_category": {"columns": categorical_cols, "threshold": 0.01},
+        "skewness": {"method": "log", "columns": numeric_cols, "threshold": 0.5},
+        "encoding": {"onehot": categorical_cols},
+        "scaling": {"standard": numeric_cols},
+    }
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 ** 2
+
+
+def bench_inplace(n_rows=200_000):
+    rows = [["Mode", "Runtime (s)", "Peak memory (MB)", "Dataset (MB)"]]
+    for inplace in (False, True):
+        df = make_dataset(n_rows)
+        config = make_config(df)
+        dataset_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        elapsed, peak = measure(
+            lambda: DataPreprocessor(df, config, problem_type="classification", inplace=inplace, verbose=False).preprocess("target")
+        )
+        rows.append(["inplace" if inplace else "copy", f"{elapsed:.2f}", f"{peak:.1f}", f"{dataset_mb:.1f}"])
+    print(tabulate(rows, headers="firstrow", tablefmt="fancy_grid"))
+
+
+def bench_fused(n_rows=200_000):
+    df = make_dataset(n_rows)
+    config = make_config(df)
+    rows = [["Mode", "Runtime (s)", "Peak memory (MB)"]]
+    
+    staged = DataPreprocessor(df, config, problem_type="classification", verbose=False)
+    elapsed, peak = measure(lambda: staged.preprocess("target"))
+    rows.append(["staged preprocess", f"{elapsed:.2f}", f"{peak:.1f}"])
+    
+    fused = DataPreprocessor(df, config, problem_type="classification", verbose=False, fuse=True)
+    elapsed, peak = measure(lambda: fused.preprocess("target"))
+    rows.append(["fused preprocess", f"{elapsed:.2f}", f"{peak:.1f}"])
+    
+    numeric = [col for cols in fused.plan.groups.values() for col in cols]
+    max_error = np.nanmax(np.abs(staged.df_processed[numeric].to_numpy() - fused.df_processed[numeric].to_numpy()))
+    
+    batch = df.copy()
+    elapsed, peak = measure(lambda: fused.plan.transform(batch))
+    rows.append(["fused transform (new batch)", f"{elapsed:.2f}", f"{peak:.1f}"])
+    
+    print(tabulate(rows, headers="firstrow", tablefmt="fancy_grid"))
+    print(f"Max abs difference staged vs fused: {max_error:.2e}")
+
+
+def bench_chunked(chunk_rows=25_000, n_chunks=(2, 8)):
+    # Peak memory of the out-of-core executor should not grow with the number of chunks.
+    output = Path(tempfile.mkdtemp()) / "chunked.parquet"
+    rows = [["Chunks", "Rows", "Runtime (s)", "Peak memory (MB)"]]
+    for count in n_chunks:
+        source = lambda: (make_dataset(chunk_rows, seed=i) for i in range(count))
+        config = make_config(make_dataset(100))
+        elapsed, peak = measure(lambda: ChunkedPreprocessor(config, target_column="target").fit_transform_to_parquet(source, output))
+        rows.append([count, f"{count * chunk_rows:,}", f"{elapsed:.2f}", f"{peak:.1f}"])
+    print(tabulate(rows, headers="firstrow", tablefmt="fancy_grid"))
+
+
+def bench_parallel_transform(n_rows=1_000_000, n_jobs=(1, 2, 4, -1)):
+    # Batch scoring throughput of the fitted handlers over row partitions.
+    df = make_dataset(n_rows)
+    preprocessor = DataPreprocessor(df.iloc[:100_000], make_config(df), problem_type="classification", verbose=False)
+    preprocessor.preprocess("target")
+    rows = [["n_jobs", "Runtime (s)", "Rows / s"]]
+    for jobs in n_jobs:
+        start = time.perf_counter()
+        preprocessor.transform(df, n_jobs=jobs)
+        elapsed = time.perf_counter() - start
+        rows.append([jobs, f"{elapsed:.2f}", f"{n_rows / elapsed:,.0f}"])
+    print(tabulate(rows, headers="firstrow", tablefmt="fancy_grid"))
+
+
+def bench_float32(n_rows=200_000):
+    # Bulk scoring memory with dtype='float32', and how far its output drifts from float64.
+    df = make_dataset(n_rows)
+    config = make_config(df)
+    batch = make_dataset(n_rows, seed=7)
+    rows = [["dtype", "Fit (s)", "Transform peak (MB)", "Output (MB)"]]
+    outputs = {}
+    for dtype in (None, "float32"):
+        preprocessor = DataPreprocessor(df, config, problem_type="classification", verbose=False, dtype=dtype)
+        elapsed, _ = measure(lambda: preprocessor.preprocess("target"))
+        _, peak = measure(lambda: outputs.__setitem__(dtype, preprocessor.transform(batch)))
+        output_mb = outputs[dtype].memory_usage(deep=True).sum() / 1024 ** 2
+        rows.append([dtype or "float64", f"{elapsed:.2f}", f"{peak:.1f}", f"{output_mb:.1f}"])
+    print(tabulate(rows, headers="firstrow", tablefmt="fancy_grid"))
+    
+    float_cols = outputs["float32"].select_dtypes(include=["float32"]).columns
+    max_error = np.nanmax(np.abs(outputs[None][float_cols].to_numpy() - outputs["float32"][float_cols].to_numpy(dtype=float)))
+    print(f"Max abs difference float64 vs float32: {max_error:.2e}")
+
+
+if __name__ == "__main__":
+    bench_inplace()
+    bench_fused()
+    bench_chunked()
+    bench_parallel_transform()
+    bench_float32()
@@ -1,13 +1,28 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_selection import SelectKBest, f_classif, f_regression, RFE
+from sklearn.feature_selection import SelectKBest, f_classif, f_regression, RFE, mutual_info_classif, mutual_info_regression
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.decomposition import PCA
-from itertools import combinations
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.inspection import permutation_importance
+from sklearn.model_selection import train_test_split
+from sklearn.utils import gen_batches
+from itertools import combinations_with_replacement, islice
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import warnings
 from scipy import stats
 import shutil
+import sys
+import json
+import hashlib
+import ast
+import re
+try:
+    from preprocess.data_preprocess import DiskCache
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'preprocess'))
+    from data_preprocess import DiskCache
 warnings.filterwarnings('ignore')
 
 def print_line(title="", char="="):
@@ -18,148 +33,873 @@ def print_line(title="", char="="):
         print(char * width)
 
 
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def polynomial_name(columns, term):
+    powers = {}
+    for i in term:
+        powers[i] = powers.get(i, 0) + 1
+    return ' '.join(f'{columns[i]}^{p}' if p > 1 else f'{columns[i]}' for i, p in powers.items())
+
+def standardize_rows(block, copy=True):
+    # Centres and unit-normalises each row, treating non-finite values as the row mean,
+    # so a dot product of two rows is their correlation. With copy=False a writable
+    # block is standardised in place.
+    block = np.array(block, dtype=float, copy=copy)
+    finite = np.isfinite(block)
+    block[~finite] = 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        block -= (block.sum(axis=1) / finite.sum(axis=1))[:, None]
+    block[~finite] = 0
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+    return block
+
+ROW_STATISTICS = ('mean', 'std', 'max', 'min', 'range', 'null_count', 'median')
+
+def row_statistic_quantile(stat):
+    # 'median' and 'q<percent>' (e.g. 'q25') are quantiles; the other built-ins are not.
+    if stat == 'median':
+        return 0.5
+    if stat.startswith('q') and stat[1:].isdigit() and int(stat[1:]) <= 100:
+        return int(stat[1:]) / 100
+    if stat not in ROW_STATISTICS:
+        raise ValueError(f"Unknown row statistic '{stat}', expected one of {ROW_STATISTICS} or 'q<percent>'")
+    return None
+
+def row_statistics(values, statistics=('mean', 'std', 'max', 'min', 'range'), columns=None, chunk_rows=None):
+    # Row-wise statistics in a single pass: each row chunk is loaded once into a small
+    # contiguous float block and every statistic is taken from it while it is in
+    # cache. values is a 2-D array or a DataFrame (columns selects from it without
+    # copying the rest). NaNs are skipped as pandas does; std uses ddof=1.
+    quantiles = {stat: row_statistic_quantile(stat) for stat in statistics}
+    if isinstance(values, pd.DataFrame):
+        positions = np.arange(values.shape[1]) if columns is None else values.columns.get_indexer(columns)
+        n_rows, n_cols = len(values), len(positions)
+    else:
+        n_rows, n_cols = values.shape
+    chunk_rows = chunk_rows or max(256, 2 ** 18 // max(n_cols, 1))
+    out = {stat: np.empty(n_rows) for stat in statistics}
+    
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        if isinstance(values, pd.DataFrame):
+            block = values.iloc[start:stop, positions].to_numpy(dtype=float, na_value=np.nan)
+        else:
+            block = values[start:stop]
+        block = np.array(block, dtype=float, order='C')
+        missing = np.isnan(block)
+        count = n_cols - missing.sum(axis=1)
+        with np.errstate(all='ignore'):
+            for stat, q in quantiles.items():
+                if q is not None:
+                    out[stat][start:stop] = np.nanquantile(block, q, axis=1)
+            if 'null_count' in out:
+                out['null_count'][start:stop] = n_cols - count
+            if {'max', 'range'} & out.keys():
+                high = np.fmax.reduce(block, axis=1)
+                out.get('max', high)[start:stop] = high
+            if {'min', 'range'} & out.keys():
+                low = np.fmin.reduce(block, axis=1)
+                out.get('min', low)[start:stop] = low
+            if 'range' in out:
+                out['range'][start:stop] = high - low
+            if {'mean', 'std'} & out.keys():
+                block[missing] = 0
+                mean = block.sum(axis=1) / count
+                out.get('mean', mean)[start:stop] = mean
+            if 'std' in out:
+                block -= mean[:, None]
+                block[missing] = 0
+                var = np.einsum('ij,ij->i', block, block) / (count - 1)
+                out['std'][start:stop] = np.where(count > 1, np.sqrt(var), np.nan)
+    return out
+
+
+class FeatureExpression:
+    # A feature described by an operation over base columns or other expressions.
+    # Nothing is computed until evaluate(), so candidates can be scored and dropped
+    # without ever being materialised.
+    def __init__(self, name, op, inputs=(), params=None):
+        self.name = name
+        self.op = op
+        self.inputs = tuple(inputs)
+        self.params = params or {}
+    
+    def __repr__(self):
+        inputs = ', '.join(inp.name if isinstance(inp, FeatureExpression) else str(inp) for inp in self.inputs)
+        return f"FeatureExpression({self.name!r}, {self.op}({inputs}))"
+    
+    def columns(self):
+        found = set()
+        for inp in self.inputs:
+            found |= inp.columns() if isinstance(inp, FeatureExpression) else {inp}
+        return found
+    
+    def _resolved(self, value, df, graph):
+        if isinstance(value, FeatureExpression) or value in df.columns or value not in (graph or {}):
+            return value
+        return graph[value]
+    
+    def base_columns(self, df, graph=None):
+        # Columns of df the value depends on, following names that resolve to expressions.
+        found = set()
+        for inp in self.inputs:
+            inp = self._resolved(inp, df, graph)
+            found |= inp.base_columns(df, graph) if isinstance(inp, FeatureExpression) else {inp}
+        return found
+    
+    def definition(self, df, graph=None):
+        # Name-independent description of what is computed, for cache keys.
+        inputs = []
+        for inp in self.inputs:
+            inp = self._resolved(inp, df, graph)
+            inputs.append(inp.definition(df, graph) if isinstance(inp, FeatureExpression) else ['column', str(inp)])
+        params = {key: value if isinstance(value, (str, tuple)) else float(value) for key, value in self.params.items()}
+        return [self.op, inputs, params]
+    
+    def _input(self, value, df, cache, graph):
+        # Names resolve to a column of df first, then to a recorded expression.
+        if not isinstance(value, FeatureExpression):
+            if value in df.columns:
+                return df[value].to_numpy(dtype=float, na_value=np.nan)
+            value = graph[value]
+        if value.name not in cache:
+            cache[value.name] = value.evaluate(df, cache, graph)
+        return cache[value.name]
+    
+    def evaluate(self, df, cache=None, graph=None):
+        cache = {} if cache is None else cache
+        if self.op == 'constant':
+            return np.full(len(df), self.params['value'], dtype=float)
+        if self.op == 'row_stat':
+            # Every statistic of the group comes out of one kernel pass, shared through cache.
+            key = ('row_stat', self.inputs, self.params['statistics'])
+            if key not in cache:
+                cache[key] = row_statistics(df, self.params['statistics'], columns=list(self.inputs))
+            return cache[key][self.params['stat']]
+        
+        values = [self._input(value, df, cache, graph or {}) for value in self.inputs]
+        with np.errstate(all='ignore'):
+            if self.op in ('poly', 'x'):
+                return reduce(np.multiply, values)
+            if self.op == 'div':
+                return np.divide(values[0], values[1], out=np.zeros(len(df)), where=values[1] != 0)
+            if self.op == 'add':
+                return values[0] + values[1]
+            if self.op == 'sub':
+                return values[0] - values[1]
+            if self.op == 'log':
+                return np.log(values[0])
+            if self.op == 'sqrt':
+                return np.sqrt(values[0])
+            if self.op == 'scaled':
+                return (values[0] - self.params['mean']) / self.params['std']
+        raise ValueError(f"Unknown feature operation: {self.op}")
+
+def expression_buffer(expressions, df, graph=None, cache=None, clean=False, store=None, hashes=None):
+    # Evaluates expressions into one preallocated (feature, row) buffer. clean=True
+    # applies the pipeline's NaN/inf -> 0 rule in place. With a FeatureCache as
+    # store, features already on disk are read instead of computed; column hashes
+    # are shared only within the call unless the caller passes its own hashes.
+    cache = {} if cache is None else cache
+    hashes = {} if hashes is None else hashes
+    buffer = np.empty((len(expressions), len(df)))
+    for k, expression in enumerate(expressions):
+        if expression.name in cache:
+            buffer[k] = cache[expression.name]
+        elif store is not None:
+            key = store.key(df, expression.base_columns(df, graph), expression.definition(df, graph), hashes)
+            buffer[k] = store.fetch(key, lambda: expression.evaluate(df, cache, graph))
+        else:
+            buffer[k] = expression.evaluate(df, cache, graph)
+    if clean:
+        np.nan_to_num(buffer, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    return buffer
+
+def evaluate_expressions(expressions, df, graph=None, cache=None, clean=False, store=None, hashes=None):
+    # The buffer is column-major, so it becomes the frame's block without a copy.
+    buffer = expression_buffer(expressions, df, graph, cache, clean, store, hashes)
+    return pd.DataFrame(buffer.T, index=df.index, columns=[e.name for e in expressions], copy=False)
+
+
+class FeatureCache(DiskCache):
+    # Engineered feature columns keyed by (fingerprint of the input columns a feature
+    # reads, hash of its definition). Each feature is its own .npy file, so reads are
+    # memory-mapped and any pipeline sharing the base columns reuses it, whatever
+    # else its frame holds. Writes never evict: FeatureEngineer evicts once per
+    # run_pipeline / transform, and standalone generators leave it to evict().
+    SUFFIX = '.npy'
+    READ_ERRORS = (OSError, ValueError, EOFError)
+    
+    def __init__(self, cache_dir='.feature_cache', max_bytes=1024 ** 3, mmap=True):
+        super().__init__(cache_dir, max_bytes)
+        self.mmap = mmap
+        self._versions = json.dumps(self.library_versions(), sort_keys=True)
+    
+    @staticmethod
+    def library_versions():
+        return DiskCache.library_versions(__file__)
+    
+    def _read(self, path):
+        return np.load(path, mmap_mode='r' if self.mmap else None, allow_pickle=False)
+    
+    def _write(self, f, values):
+        np.save(f, values, allow_pickle=False)
+    
+    @staticmethod
+    def column_hash(series):
+        return hashlib.sha256(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()
+                              + str(series.dtype).encode()).hexdigest()
+    
+    def key(self, df, columns, definition, hashes=None):
+        # hashes memoises column hashes across keys of the same unmodified frame; it
+        # must not outlive an edit of df, so nothing is remembered between calls here.
+        hashes = {} if hashes is None else hashes
+        for col in [None, *columns]:
+            if col not in hashes:
+                hashes[col] = self.column_hash(pd.Series(df.index) if col is None else df[col])
+        data = sorted([str(col), hashes[col]] for col in columns)
+        parts = [json.dumps([hashes[None], data]), json.dumps(definition, sort_keys=True), self._versions]
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+    
+    def fetch(self, key, compute):
+        values = self.get(key)
+        if values is None:
+            values = np.asarray(compute())
+            # Object columns would need pickling; they are recomputed instead.
+            if not values.dtype.hasobject:
+                self.put(key, values, evict=False)
+        return values
+
+
 class AutoFeatureGenerator:
-    def __init__(self, target_type='classification'):
+    OPERATIONS = ('x', 'div', 'add', 'sub')
+    
+    def __init__(self, target_type='classification', max_features=50, max_candidates=20000, batch_size=512,
+                 sample_rows=10000, memory_budget=512 * 1024 ** 2, random_state=42, cache=None,
+                 row_statistics=('mean', 'std', 'max', 'min', 'range')):
         self.target_type = target_type
+        self.max_features = max_features
+        self.max_candidates = max_candidates
+        self.batch_size = batch_size
+        self.sample_rows = sample_rows
+        self.memory_budget = memory_budget
+        self.random_state = random_state
+        self.cache = cache
+        for stat in row_statistics:
+            row_statistic_quantile(stat)
+        self.row_statistics = tuple(row_statistics)
         self.polynomial_features = None
         self.interaction_features = []
+        self.base_scores = None
+        self.feature_scores = {}
     
-    def generate_polynomial_features(self, df, degree=2, include_bias=False):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if len(numeric_cols) > 10:
-            numeric_cols = numeric_cols[:10]
-        
-        if len(numeric_cols) > 0:
-            poly = PolynomialFeatures(degree=degree, include_bias=include_bias)
-            poly_features = poly.fit_transform(df[numeric_cols])
-            feature_names = poly.get_feature_names_out(numeric_cols)
-            
-            poly_df = pd.DataFrame(poly_features, columns=feature_names, index=df.index)
-            original_cols = [col for col in feature_names if col in numeric_cols]
-            new_cols = [col for col in feature_names if col not in numeric_cols]
-            
-            self.polynomial_features = poly
-            return poly_df[new_cols]
-        return pd.DataFrame()
+    def _base_columns(self, df, target_col=None):
+        return [col for col in df.select_dtypes(include=[np.number]).columns if col != target_col]
     
-    def generate_interaction_features(self, df, max_interactions=20):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if len(numeric_cols) > 10:
-            numeric_cols = numeric_cols[:10]
-        
-        interaction_df = pd.DataFrame(index=df.index)
-        count = 0
-        
-        for col1, col2 in combinations(numeric_cols, 2):
-            if count >= max_interactions:
-                break
-            
-            interaction_df[f'{col1}_x_{col2}'] = df[col1] * df[col2]
-            interaction_df[f'{col1}_div_{col2}'] = np.where(df[col2] != 0, df[col1] / df[col2], 0)
-            interaction_df[f'{col1}_add_{col2}'] = df[col1] + df[col2]
-            interaction_df[f'{col1}_sub_{col2}'] = df[col1] - df[col2]
-            
-            self.interaction_features.extend([f'{col1}_x_{col2}', f'{col1}_div_{col2}', 
-                                           f'{col1}_add_{col2}', f'{col1}_sub_{col2}'])
-            count += 4
-        
-        return interaction_df
+    def _sample_index(self, df):
+        if len(df) <= self.sample_rows:
+            return np.arange(len(df))
+        rng = np.random.default_rng(self.random_state)
+        return np.sort(rng.choice(len(df), self.sample_rows, replace=False))
     
-    def generate_statistical_features(self, df):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        stat_df = pd.DataFrame(index=df.index)
-        
-        if len(numeric_cols) >= 2:
-            stat_df['mean_all'] = df[numeric_cols].mean(axis=1)
-            stat_df['std_all'] = df[numeric_cols].std(axis=1)
-            stat_df['max_all'] = df[numeric_cols].max(axis=1)
-            stat_df['min_all'] = df[numeric_cols].min(axis=1)
-            stat_df['range_all'] = stat_df['max_all'] - stat_df['min_all']
-        
-        return stat_df
+    def _batch_size(self, n_rows):
+        # Scoring batches take a small slice of the memory budget.
+        return max(1, min(self.batch_size, self.memory_budget // (32 * 8 * max(n_rows, 1))))
     
-    def generate_log_features(self, df):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        log_df = pd.DataFrame(index=df.index)
-        
-        for col in numeric_cols:
-            if df[col].min() > 0:
-                log_df[f'log_{col}'] = np.log(df[col])
-                log_df[f'sqrt_{col}'] = np.sqrt(df[col])
-        
-        return log_df
+    def _target_sample(self, df, target_col, rows):
+        if target_col is None or target_col not in df.columns:
+            return None
+        target = df[target_col].iloc[rows]
+        if not pd.api.types.is_numeric_dtype(target):
+            target = pd.Series(pd.factorize(target)[0], dtype=float).where(target.notna().to_numpy())
+        return standardize_rows(target.to_numpy(dtype=float, na_value=np.nan)[None, :])[0]
     
-    def generate_all_features(self, df):
-        all_features = []
-        
-        poly_features = self.generate_polynomial_features(df)
-        if not poly_features.empty:
-            all_features.append(poly_features)
+    def rank_base_columns(self, df, target_col=None):
+        # Cheap relevance score on a row sample: |correlation| with the target, or the
+        # number of distinct values when there is none. Ties are broken by name so the
+        # ranking does not depend on column order.
+        columns = self._base_columns(df, target_col)
+        rows = self._sample_index(df)
+        target = self._target_sample(df, target_col, rows)
+        scores = np.zeros(len(columns))
+        batch_size = self._batch_size(len(rows))
+        for start in range(0, len(columns), batch_size):
+            chunk = columns[start:start + batch_size]
+            sample = df.iloc[rows, df.columns.get_indexer(chunk)]
+            if target is None:
+                scores[start:start + len(chunk)] = sample.nunique().to_numpy()
+            else:
+                block = standardize_rows(sample.to_numpy(dtype=float, na_value=np.nan).T)
+                scores[start:start + len(chunk)] = np.abs(block @ target)
+        ranked = pd.Series(scores, index=columns).sort_index(key=lambda idx: idx.astype(str))
+        self.base_scores = ranked.sort_values(ascending=False, kind='stable')
+        return self.base_scores.index.tolist()
+    
+    def _interaction_candidates(self, n_columns):
+        # Pairs are enumerated by their lower-ranked member, so every pair among the top m
+        # columns is produced before any pair involving column m + 1.
+        for j in range(1, n_columns):
+            for i in range(j):
+                for op in self.OPERATIONS:
+                    yield op, (i, j)
+    
+    def _polynomial_candidates(self, n_columns, degree):
+        for j in range(n_columns):
+            for d in range(2, degree + 1):
+                for head in combinations_with_replacement(range(j + 1), d - 1):
+                    yield 'poly', head + (j,)
+    
+    def _evaluate(self, specs, values, out):
+        # values carries a trailing row of ones, so shorter product terms pad with -1.
+        width = max(len(idx) for _, idx in specs)
+        index = np.array([idx + (-1,) * (width - len(idx)) for _, idx in specs])
+        ops = np.array([op for op, _ in specs])
+        for op in np.unique(ops):
+            rows = np.flatnonzero(ops == op)
+            a, b = values[index[rows, 0]], values[index[rows, 1]]
+            if op in ('x', 'poly'):
+                result = np.multiply(a, b, out=a)
+                for p in range(2, width):
+                    result *= values[index[rows, p]]
+            elif op == 'div':
+                result = np.divide(a, b, out=np.zeros_like(a), where=b != 0)
+            elif op == 'add':
+                result = np.add(a, b, out=a)
+            else:
+                result = np.subtract(a, b, out=a)
+            out[rows] = result
+    
+    def _score(self, specs, block, target, parents):
+        standardized = standardize_rows(block, copy=False)
+        if target is not None:
+            return np.abs(standardized @ target)
+        # Without a target, prefer features least explained by the columns they came from.
+        redundancy = np.zeros(len(specs))
+        for p in range(max(len(idx) for _, idx in specs)):
+            index = np.array([idx[p] if p < len(idx) else -1 for _, idx in specs])
+            corr = np.abs(np.einsum('ij,ij->i', standardized, parents[index]))
+            redundancy = np.maximum(redundancy, np.where(index >= 0, corr, 0))
+        return 1 - redundancy
+    
+    def _with_ones(self, df, columns, rows):
+        # Column-major sample of the base columns plus a row of ones, filled column by
+        # column so no intermediate frame is built.
+        values = np.ones((len(columns) + 1, len(rows)))
+        for k, col in enumerate(columns):
+            values[k] = df[col].to_numpy(dtype=float, na_value=np.nan)[rows]
+        return values
+    
+    def budgeted_expressions(self, df, candidates, n_features, target_col=None, name=None, kind='auto'):
+        # Scores candidates lazily in batches on a row sample and keeps the top
+        # n_features as expressions; nothing is computed over all rows here.
+        ranked = self.rank_base_columns(df, target_col)
+        candidates = list(islice(candidates(len(ranked)), self.max_candidates))
+        if not candidates or n_features <= 0:
+            return []
+        n_considered = max(max(idx) for _, idx in candidates) + 1
         
-        interaction_features = self.generate_interaction_features(df)
-        if not interaction_features.empty:
-            all_features.append(interaction_features)
+        # Beyond the scoring batches, the budget bounds the buffer the survivors are
+        # materialised into and its per-feature temporaries.
+        rows = self._sample_index(df)
+        n_budgeted = self.memory_budget // (8 * len(df)) - 4
+        if n_budgeted <= 0:
+            print(f"Skipping {kind} features: {len(df):,} rows need at least {40 * len(df) / 1024 ** 2:.0f} MB, "
+                  f"memory_budget is {self.memory_budget / 1024 ** 2:.0f} MB")
+            return []
+        if n_budgeted < n_features:
+            print(f"memory_budget limits {kind} features to {n_budgeted} of {n_features}")
+            n_features = n_budgeted
+        batch_size = self._batch_size(len(rows))
         
-        stat_features = self.generate_statistical_features(df)
-        if not stat_features.empty:
-            all_features.append(stat_features)
+        sample = self._with_ones(df, ranked[:n_considered], rows)
+        target = self._target_sample(df, target_col, rows)
+        parents = None if target is not None else standardize_rows(sample)
         
-        log_features = self.generate_log_features(df)
-        if not log_features.empty:
-            all_features.append(log_features)
+        kept = np.empty(0, dtype=int)
+        kept_scores = np.empty(0)
+        buffer = np.empty((batch_size, len(rows)))
+        for start, specs in zip(range(0, len(candidates), batch_size), batched(candidates, batch_size)):
+            block = buffer[:len(specs)]
+            self._evaluate(specs, sample, block)
+            positions = np.concatenate([kept, start + np.arange(len(specs))])
+            scores = np.concatenate([kept_scores, self._score(specs, block, target, parents)])
+            order = np.argsort(-scores, kind='stable')[:n_features]
+            kept, kept_scores = positions[order], scores[order]
         
-        if all_features:
-            return pd.concat(all_features, axis=1)
+        order = np.argsort(kept)
+        expressions = []
+        for i, score in zip(kept[order], kept_scores[order]):
+            op, idx = candidates[i]
+            expressions.append(FeatureExpression(name(ranked, op, idx), op, [ranked[j] for j in idx]))
+            self.feature_scores[expressions[-1].name] = score
+        return expressions
+    
+    def polynomial_expressions(self, df, degree=2, include_bias=False, max_features=None, target_col=None):
+        expressions = self.budgeted_expressions(
+            df,
+            lambda n_columns: self._polynomial_candidates(n_columns, degree),
+            self.max_features if max_features is None else max_features,
+            target_col=target_col,
+            name=lambda columns, op, idx: polynomial_name(columns, idx),
+            kind='polynomial'
+        )
+        if include_bias and expressions:
+            expressions.insert(0, FeatureExpression('1', 'constant', params={'value': 1.0}))
+        self.polynomial_features = [e.name for e in expressions]
+        return expressions
+    
+    def interaction_expressions(self, df, max_interactions=20, target_col=None):
+        expressions = self.budgeted_expressions(
+            df,
+            self._interaction_candidates,
+            max_interactions,
+            target_col=target_col,
+            name=lambda columns, op, idx: f'{columns[idx[0]]}_{op}_{columns[idx[1]]}',
+            kind='interaction'
+        )
+        self.interaction_features.extend(e.name for e in expressions)
+        return expressions
+    
+    def statistical_expressions(self, df, target_col=None):
+        numeric_cols = self._base_columns(df, target_col)
+        if len(numeric_cols) < 2:
+            return []
+        return [FeatureExpression(f'{stat}_all', 'row_stat', numeric_cols,
+                                  {'stat': stat, 'statistics': self.row_statistics})
+                for stat in self.row_statistics]
+    
+    def log_expressions(self, df, target_col=None):
+        expressions = []
+        for col in self._base_columns(df, target_col):
+            if df[col].min() > 0:
+                expressions.append(FeatureExpression(f'log_{col}', 'log', [col]))
+                expressions.append(FeatureExpression(f'sqrt_{col}', 'sqrt', [col]))
+        return expressions
+    
+    def generate_expressions(self, df, target_col=None):
+        return (self.polynomial_expressions(df, target_col=target_col)
+                + self.interaction_expressions(df, target_col=target_col)
+                + self.statistical_expressions(df, target_col)
+                + self.log_expressions(df, target_col))
+    
+    def generate_polynomial_features(self, df, degree=2, include_bias=False, max_features=None, target_col=None):
+        expressions = self.polynomial_expressions(df, degree, include_bias, max_features, target_col)
+        return evaluate_expressions(expressions, df, store=self.cache) if expressions else pd.DataFrame()
+    
+    def generate_interaction_features(self, df, max_interactions=20, target_col=None):
+        return evaluate_expressions(self.interaction_expressions(df, max_interactions, target_col), df, store=self.cache)
+    
+    def generate_statistical_features(self, df, target_col=None):
+        return evaluate_expressions(self.statistical_expressions(df, target_col), df, store=self.cache)
+    
+    def generate_log_features(self, df, target_col=None):
+        return evaluate_expressions(self.log_expressions(df, target_col), df, store=self.cache)
+    
+    def generate_all_features(self, df, target_col=None):
+        expressions = self.generate_expressions(df, target_col)
+        if expressions:
+            return evaluate_expressions(expressions, df, store=self.cache)
         return pd.DataFrame()
 
 
 class ManualFeatureGenerator:
-    def __init__(self, config):
+    # Formulas are parsed once, when the generator is built, so bad syntax fails at
+    # config time. Together they form one DAG in which identical subexpressions are
+    # the same node (nodes are nested tuples), and a name defined by an earlier
+    # formula is inlined. Nodes used more than once are computed once. Each formula
+    # is then a single numexpr call when numexpr is installed and its inputs allow it;
+    # otherwise it is evaluated with numpy.
+    FUNCTIONS = ('sin', 'cos', 'exp', 'log', 'expm1', 'log1p', 'sqrt', 'sinh', 'cosh', 'tanh', 'arcsin',
+                 'arccos', 'arctan', 'arccosh', 'arcsinh', 'arctanh', 'abs', 'arctan2')
+    BINARY_OPS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Pow: '**', ast.Mod: '%',
+                  ast.FloorDiv: '//', ast.BitAnd: '&', ast.BitOr: '|'}
+    COMPARE_OPS = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!='}
+    NUMPY_OPS = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.true_divide, '**': np.power,
+                 '%': np.mod, '//': np.floor_divide, '&': np.bitwise_and, '|': np.bitwise_or, '<': np.less,
+                 '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal}
+    
+    NUMEXPR_DTYPES = tuple(np.dtype(dtype) for dtype in (bool, np.int32, np.int64, np.float32, np.float64))
+    
+    def __init__(self, config, cache=None, use_numexpr=True, n_threads=None):
         self.config = config
+        self.cache = cache
+        self.n_threads = n_threads
         self.created_features = []
+        self.formulas = {}
+        self._numexpr = None
+        if use_numexpr:
+            try:
+                import numexpr
+                self._numexpr = numexpr
+            except ImportError:
+                self._numexpr = None
+        for feature_name, expression in config.get("manual_features", {}).items():
+            try:
+                self.formulas[feature_name] = self.parse(expression)
+            except (SyntaxError, ValueError) as e:
+                raise ValueError(f"Invalid manual feature {feature_name!r} = {expression!r}: {e}") from e
+        self.shared = self._shared_nodes()
     
-    def create_features(self, df):
-        result_df = df.copy()
+    def parse(self, expression):
+        # Backtick-quoted column names, as accepted by DataFrame.eval, become placeholders.
+        quoted = {}
+        def placeholder(match):
+            quoted[f'__quoted_{len(quoted)}'] = match.group(1)
+            return f'__quoted_{len(quoted) - 1}'
+        tree = ast.parse(re.sub(r'`([^`]*)`', placeholder, expression.strip()), mode='eval')
+        return self._node(tree.body, quoted)
+    
+    def _node(self, node, quoted):
+        if isinstance(node, ast.Name):
+            name = quoted.get(node.id, node.id)
+            return self.formulas.get(name, ('col', name))
+        if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float, str)):
+            return ('const', node.value)
+        if isinstance(node, ast.BinOp) and type(node.op) in self.BINARY_OPS:
+            return ('bin', self.BINARY_OPS[type(node.op)], self._node(node.left, quoted), self._node(node.right, quoted))
+        if isinstance(node, ast.UnaryOp):
+            operand = self._node(node.operand, quoted)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(node.op, ast.USub):
+                if operand[0] == 'const' and not isinstance(operand[1], (bool, str)):
+                    return ('const', -operand[1])
+                return ('unary', '-', operand)
+            return ('unary', '~', operand)
+        if isinstance(node, ast.BoolOp):
+            op = '&' if isinstance(node.op, ast.And) else '|'
+            return reduce(lambda a, b: ('bin', op, a, b), [self._node(value, quoted) for value in node.values])
+        if isinstance(node, ast.Compare) and all(type(op) in self.COMPARE_OPS for op in node.ops):
+            operands = [self._node(value, quoted) for value in [node.left, *node.comparators]]
+            parts = [('cmp', self.COMPARE_OPS[type(op)], a, b) for op, a, b in zip(node.ops, operands, operands[1:])]
+            return reduce(lambda a, b: ('bin', '&', a, b), parts)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in self.FUNCTIONS
+                and not node.keywords):
+            return ('call', node.func.id, *[self._node(arg, quoted) for arg in node.args])
+        raise ValueError(f"unsupported syntax {type(node).__name__}")
+    
+    @staticmethod
+    def _children(node):
+        return node[2:] if node[0] in ('bin', 'cmp', 'unary', 'call') else ()
+    
+    def _shared_nodes(self):
+        # A node is shared when it is a formula of its own or has more than one
+        # distinct parent; leaves are never worth caching.
+        parents, uses = {}, {}
+        pending = list(set(self.formulas.values()))
+        for root in pending:
+            uses[root] = uses.get(root, 0) + 1
+        seen = set()
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            for child in set(self._children(node)):
+                parents.setdefault(child, set()).add(node)
+                pending.append(child)
+        return {node for node in seen if self._children(node)
+                and uses.get(node, 0) + len(parents.get(node, ())) > 1}
+    
+    def columns(self, node):
+        if node[0] == 'col':
+            return {node[1]}
+        return set().union(*(self.columns(child) for child in self._children(node)))
+    
+    def _column(self, df, name):
+        values = df[name]
+        if isinstance(values.dtype, np.dtype):
+            return values.to_numpy()
+        if pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_numeric_dtype(values.dtype):
+            return values.to_numpy(dtype=float, na_value=np.nan)
+        return values.to_numpy(dtype=object)
+    
+    def _render(self, node, df, memo, env, top=True):
+        # numexpr text for node; columns and shared nodes below it become variables
+        # in env. Returns None when numexpr cannot express the node.
+        kind = node[0]
+        if kind == 'const':
+            return None if isinstance(node[1], str) else repr(node[1])
+        if kind == 'col' or (not top and node in self.shared):
+            if node not in env:
+                env[node] = self._column(df, node[1]) if kind == 'col' else self._value(node, df, memo)
+            if env[node].dtype not in self.NUMEXPR_DTYPES:
+                return None
+            return f'v{list(env).index(node)}'
+        parts = [self._render(child, df, memo, env, top=False) for child in self._children(node)]
+        if None in parts or (kind == 'bin' and node[1] == '//'):
+            return None
+        if kind == 'call':
+            return f"{node[1]}({', '.join(parts)})"
+        if kind == 'unary':
+            return f"({node[1]}{parts[0]})"
+        return f"({parts[0]} {node[1]} {parts[1]})"
+    
+    def _compute(self, node, df, memo, env, top=True):
+        kind = node[0]
+        if kind == 'const':
+            return node[1]
+        if kind == 'col' or (not top and node in self.shared):
+            if node not in env:
+                env[node] = self._column(df, node[1]) if kind == 'col' else self._value(node, df, memo)
+            return env[node]
+        args = [self._compute(child, df, memo, env, top=False) for child in self._children(node)]
+        if kind == 'call':
+            return getattr(np, node[1])(*args)
+        if kind == 'unary':
+            return np.negative(args[0]) if node[1] == '-' else np.invert(args[0])
+        return self.NUMPY_OPS[node[1]](*args)
+    
+    def _value(self, node, df, memo):
+        if node not in memo:
+            env = {}
+            text = self._render(node, df, memo, env) if self._numexpr is not None else None
+            with np.errstate(all='ignore'):
+                if text is None:
+                    memo[node] = np.asarray(self._compute(node, df, memo, env))
+                else:
+                    local_dict = {f'v{i}': values for i, values in enumerate(env.values())}
+                    memo[node] = self._numexpr.evaluate(text, local_dict=local_dict)
+        return memo[node]
+    
+    def evaluate(self, df, names, errors=None):
+        return {name: pd.Series(values, index=df.index, name=name)
+                for name, values in self._evaluate(df, names, errors).items()}
+    
+    def _evaluate(self, df, names, errors=None):
+        # Arrays for the named formulas; failures are collected in errors when given.
+        previous_threads = None
+        if self._numexpr is not None and self.n_threads:
+            previous_threads = self._numexpr.set_num_threads(self.n_threads)
         
-        if "manual_features" in self.config:
-            for feature_name, expression in self.config["manual_features"].items():
+        memo, results, hashes = {}, {}, {}
+        try:
+            for name in names:
+                node = self.formulas[name]
                 try:
-                    result_df[feature_name] = result_df.eval(expression)
-                    self.created_features.append(feature_name)
+                    if self.cache is None:
+                        values = self._value(node, df, memo)
+                    else:
+                        key = self.cache.key(df, sorted(self.columns(node), key=str), ['manual', repr(node)], hashes)
+                        values = self.cache.fetch(key, lambda: self._value(node, df, memo))
+                    if np.ndim(values) == 0:
+                        values = np.full(len(df), values)
+                    elif not (values.flags.owndata and values.flags.writeable):
+                        # A bare column reference or a memory-mapped cache hit.
+                        values = np.array(values)
+                    results[name] = values
                 except Exception as e:
-                    print(f"Error creating feature {feature_name}: {e}")
+                    if errors is None:
+                        raise
+                    errors[name] = e
+        finally:
+            if previous_threads is not None:
+                self._numexpr.set_num_threads(previous_threads)
+        return results
+    
+    def create_features(self, df):
+        errors = {}
+        new_features = self._evaluate(df, list(self.formulas), errors)
+        for feature_name, e in errors.items():
+            print(f"Error creating feature {feature_name}: {e}")
+        self.created_features.extend(new_features)
         
+        # All new columns land in one concat; names that overwrite a column keep its position.
+        # The evaluated arrays are fresh, so the frame takes them without copying.
+        new_df = pd.DataFrame(new_features, index=df.index, copy=False)
+        overwritten = [col for col in new_df.columns if col in df.columns]
+        result_df = pd.concat([df, new_df.drop(columns=overwritten)], axis=1)
+        if overwritten:
+            result_df[overwritten] = new_df[overwritten]
         return result_df
 
 
 class FeatureTransformer:
-    def __init__(self):
+    def __init__(self, cache=None):
+        self.cache = cache
         self.transformations = {}
+        self.expressions = {}
     
-    def apply_transformations(self, df):
-        result_df = df.copy()
-        numeric_cols = result_df.select_dtypes(include=[np.number]).columns
+    def derive(self, name, values, source=None):
+        # The log/scaled features a column earns, decided on its values as they stand.
+        # source is what the derived expressions read: the column name by default,
+        # or the expression that produced values.
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        source = name if source is None else source
+        derived = []
+        if series.skew() > 1 and series.min() > 0:
+            derived.append(FeatureExpression(f'{name}_log', 'log', [source]))
+        if series.var() > 1000:
+            derived.append(FeatureExpression(f'{name}_scaled', 'scaled', [source],
+                                             {'mean': series.mean(), 'std': series.std()}))
         
-        for col in numeric_cols:
-            if result_df[col].skew() > 1:
-                if result_df[col].min() > 0:
-                    result_df[f'{col}_log'] = np.log(result_df[col])
-                    self.transformations[f'{col}_log'] = 'log'
-            
-            if result_df[col].var() > 1000:
-                result_df[f'{col}_scaled'] = (result_df[col] - result_df[col].mean()) / result_df[col].std()
-                self.transformations[f'{col}_scaled'] = 'scaled'
+        for expression in derived:
+            self.transformations[expression.name] = expression.op
+            self.expressions[expression.name] = expression
+        return derived
+    
+    def apply_transformations(self, df, exclude=()):
+        result_df = df.copy()
+        numeric_cols = [col for col in result_df.select_dtypes(include=[np.number]).columns if col not in exclude]
         
+        derived = [expression for col in numeric_cols for expression in self.derive(col, result_df[col])]
+        if derived:
+            result_df = pd.concat([result_df, evaluate_expressions(derived, result_df, store=self.cache)], axis=1)
         return result_df
 
 
 class FeatureSelector:
-    def __init__(self, selection_method='univariate', k_features=20, target_type='classification'):
+    # Methods whose scores are per-feature, so candidates can be scored batch by batch.
+    BATCHED_METHODS = ('univariate', 'variance')
+    
+    IMPORTANCES = ('model', 'permutation', 'lightgbm')
+    # Methods that pick relevant features while skipping ones redundant with those already picked.
+    REDUNDANCY_METHODS = ('mrmr', 'correlation')
+    RELEVANCES = ('mutual_info', 'f_stat')
+    
+    def __init__(self, selection_method='univariate', k_features=20, target_type='classification', step=1,
+                 n_jobs=-1, importance='model', patience=None, tol=1e-3, holdout=0.25, n_repeats=3,
+                 random_state=42, relevance='mutual_info', max_correlation=0.95, sample_rows=10000):
+        if importance not in self.IMPORTANCES:
+            raise ValueError(f"Unknown importance '{importance}', expected one of {self.IMPORTANCES}")
+        if relevance not in self.RELEVANCES:
+            raise ValueError(f"Unknown relevance '{relevance}', expected one of {self.RELEVANCES}")
         self.selection_method = selection_method
         self.k_features = k_features
         self.target_type = target_type
+        # RFE: step is a feature count (>= 1) or a fraction of the remaining features
+        # dropped per round; n_jobs goes to the inner estimator and permutation scoring.
+        self.step = step
+        self.n_jobs = n_jobs
+        self.importance = importance
+        self.patience = patience
+        self.tol = tol
+        self.holdout = holdout
+        self.n_repeats = n_repeats
+        self.random_state = random_state
+        # mrmr / correlation: relevance is scored once on at most sample_rows rows, and
+        # the correlation filter drops candidates above max_correlation with a pick.
+        self.relevance = relevance
+        self.max_correlation = max_correlation
+        self.sample_rows = sample_rows
         self.selector = None
         self.selected_features = []
+        self.scores = None
+        self.history = []
+    
+    def score_batch(self, X, y):
+        if self.selection_method == 'univariate':
+            score_func = f_classif if self.target_type == 'classification' else f_regression
+            return score_func(X, y)[0]
+        return X.var().to_numpy()
+    
+    def select_scored(self, scores):
+        # Picks from scores gathered by score_batch exactly as select_features would
+        # from the full frame: SelectKBest's NaN handling and column order for
+        # univariate, nlargest order for variance.
+        self.scores = scores
+        k = min(self.k_features, len(scores))
+        if self.selection_method == 'univariate':
+            values = scores.to_numpy(dtype=float)
+            values = np.where(np.isnan(values), np.finfo(float).min, values)
+            support = np.zeros(len(scores), dtype=bool)
+            support[np.argsort(values, kind='mergesort')[len(values) - k:]] = True
+            self.selected_features = scores.index[support].tolist()
+        else:
+            self.selected_features = scores.nlargest(k).index.tolist()
+        return self.selected_features
+    
+    def _estimator(self):
+        classification = self.target_type == 'classification'
+        if self.importance == 'lightgbm':
+            try:
+                import lightgbm
+            except ImportError:
+                raise ImportError("importance='lightgbm' requires the lightgbm package") from None
+            estimator = lightgbm.LGBMClassifier if classification else lightgbm.LGBMRegressor
+            return estimator(n_estimators=100, importance_type='gain', n_jobs=self.n_jobs,
+                             random_state=self.random_state, verbose=-1)
+        estimator = RandomForestClassifier if classification else RandomForestRegressor
+        return estimator(n_estimators=100, random_state=self.random_state, n_jobs=self.n_jobs)
+    
+    def _eliminate(self, X, y):
+        # Recursive elimination with a holdout split, so importances can come from a
+        # cheaper proxy (permutation on the holdout, LightGBM gain) and the loop can
+        # stop once the holdout score has not improved by tol for patience rounds.
+        # The k survivors are then the most important features of the last fit.
+        k = min(self.k_features, X.shape[1])
+        stratify = y if self.target_type == 'classification' and y.value_counts().min() > 1 else None
+        X_train, X_valid, y_train, y_valid = train_test_split(X, y, test_size=self.holdout, stratify=stratify,
+                                                              random_state=self.random_state)
+        features = list(X.columns)
+        best, stale = -np.inf, 0
+        self.history = []
+        while True:
+            model = self._estimator().fit(X_train[features], y_train)
+            score = model.score(X_valid[features], y_valid)
+            if self.importance == 'permutation':
+                importances = permutation_importance(model, X_valid[features], y_valid, n_repeats=self.n_repeats,
+                                                     random_state=self.random_state, n_jobs=self.n_jobs).importances_mean
+            else:
+                importances = model.feature_importances_
+            self.history.append({'n_features': len(features), 'score': score})
+            
+            ranked = np.argsort(-importances, kind='stable')
+            best, stale = (score, 0) if score > best + self.tol else (best, stale + 1)
+            if len(features) <= k or (self.patience is not None and stale >= self.patience):
+                break
+            n_drop = int(self.step) if self.step >= 1 else max(1, int(self.step * len(features)))
+            features = [features[i] for i in sorted(ranked[:max(k, len(features) - n_drop)])]
+        return [features[i] for i in sorted(ranked[:k])]
+    
+    def _relevance(self, X, y):
+        if self.relevance == 'f_stat':
+            score_func = f_classif if self.target_type == 'classification' else f_regression
+            scores = score_func(X, y)[0]
+        else:
+            score_func = mutual_info_classif if self.target_type == 'classification' else mutual_info_regression
+            scores = score_func(X, y, random_state=self.random_state)
+        return np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0)
+    
+    def _filter_redundant(self, X, y):
+        # Greedy selection over standardised sample rows: each pick costs one product of
+        # the picked row against the candidates, which updates a running redundancy
+        # (mean |corr| for mrmr, max |corr| for the filter) instead of the full matrix.
+        if len(X) > self.sample_rows:
+            rng = np.random.default_rng(self.random_state)
+            rows = np.sort(rng.choice(len(X), self.sample_rows, replace=False))
+            X, y = X.iloc[rows], y.iloc[rows]
+        values = X.to_numpy(dtype=float, na_value=np.nan)
+        block = standardize_rows(values.T)
+        finite = np.isfinite(values)
+        column_means = np.nanmean(np.where(finite, values, np.nan), axis=0)
+        relevance = self._relevance(np.nan_to_num(np.where(finite, values, column_means)), y)
+        self.scores = pd.Series(relevance, index=X.columns)
+        
+        k = min(self.k_features, X.shape[1])
+        available = np.ones(X.shape[1], dtype=bool)
+        redundancy = np.zeros(X.shape[1])
+        selected = []
+        while len(selected) < k and available.any():
+            if self.selection_method == 'mrmr' and selected:
+                criterion = relevance / np.maximum(redundancy / len(selected), 1e-6)
+            else:
+                criterion = relevance.copy()
+            criterion[~available] = -np.inf
+            pick = int(np.argmax(criterion))
+            selected.append(pick)
+            available[pick] = False
+            correlation = np.abs(block @ block[pick])
+            if self.selection_method == 'mrmr':
+                redundancy += correlation
+            else:
+                available &= correlation <= self.max_correlation
+        return X.columns[selected].tolist()
     
     def select_features(self, df, target_col):
         if target_col not in df.columns:
@@ -178,17 +918,20 @@ class FeatureSelector:
             selected_idx = self.selector.get_support()
             self.selected_features = X.columns[selected_idx].tolist()
         
+        elif self.selection_method == 'rfe' and (self.importance != 'model' or self.patience is not None or self.step < 1):
+            # sklearn's RFE reads a fractional step as a share of the initial feature
+            # count, so fractions go through _eliminate, which uses the remaining count.
+            self.selected_features = self._eliminate(X, y)
+        
         elif self.selection_method == 'rfe':
-            if self.target_type == 'classification':
-                estimator = RandomForestClassifier(n_estimators=100, random_state=42)
-            else:
-                estimator = RandomForestRegressor(n_estimators=100, random_state=42)
-            
-            self.selector = RFE(estimator, n_features_to_select=min(self.k_features, X.shape[1]))
+            self.selector = RFE(self._estimator(), n_features_to_select=min(self.k_features, X.shape[1]), step=self.step)
             X_selected = self.selector.fit_transform(X, y)
             selected_idx = self.selector.get_support()
             self.selected_features = X.columns[selected_idx].tolist()
         
+        elif self.selection_method in self.REDUNDANCY_METHODS:
+            self.selected_features = self._filter_redundant(X, y)
+        
         elif self.selection_method == 'variance':
             variances = X.var()
             high_variance_cols = variances.nlargest(min(self.k_features, len(variances))).index.tolist()
@@ -199,41 +942,127 @@ class FeatureSelector:
 
 
 class DimensionalityReducer:
-    def __init__(self, method='pca', n_components=10):
+    METHODS = ('pca', 'incremental', 'randomized')
+    
+    def __init__(self, method='pca', n_components=10, chunk_size=10000, random_state=42):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {self.METHODS}")
         self.method = method
         self.n_components = n_components
+        # Rows per partial fit for 'incremental', and rows per transformed block for every method.
+        self.chunk_size = chunk_size
+        self.random_state = random_state
         self.reducer = None
+        self.columns = None
+    
+    def _model(self):
+        if self.method == 'incremental':
+            return IncrementalPCA(n_components=self.n_components)
+        if self.method == 'randomized':
+            return PCA(n_components=self.n_components, svd_solver='randomized', random_state=self.random_state)
+        return PCA(n_components=self.n_components)
+    
+    def _partial_fit(self, blocks):
+        # IncrementalPCA needs at least n_components rows per call, so each block is
+        # held back until the next one arrives, and a short block is merged with its
+        # neighbour, whether it comes first, last or in between.
+        held = None
+        for block in blocks:
+            if held is None:
+                held = block
+            elif len(held) < self.n_components or len(block) < self.n_components:
+                held = np.vstack([held, block])
+            else:
+                self.reducer.partial_fit(held)
+                held = block
+        if held is None:
+            raise ValueError("No rows to fit the dimensionality reducer on")
+        self.reducer.partial_fit(held)
+    
+    def fit(self, chunks, target_col=None):
+        # Streams frames through IncrementalPCA so the data never has to fit in memory.
+        # `chunks` is a list of frames or a callable returning a fresh iterator, e.g.
+        # lambda: pd.read_csv(path, chunksize=100_000).
+        if self.method != 'incremental':
+            raise ValueError(f"Method '{self.method}' needs the full dataset and cannot be fitted in chunks")
+        self.reducer = self._model()
+        self.columns = None
+        
+        def blocks():
+            for chunk in (chunks() if callable(chunks) else chunks):
+                if self.columns is None:
+                    self.columns = [col for col in chunk.columns if col != target_col]
+                yield chunk[self.columns].to_numpy(dtype=float)
+        
+        self._partial_fit(blocks())
+        return self
+    
+    def transform(self, df, target_col=None):
+        if self.reducer is None:
+            raise ValueError("The dimensionality reducer has not been fitted")
+        X_reduced = np.empty((len(df), self.n_components))
+        for rows in gen_batches(len(df), self.chunk_size):
+            X_reduced[rows] = self.reducer.transform(df[self.columns].iloc[rows].to_numpy(dtype=float))
+        
+        feature_names = [f'PC{i+1}' for i in range(self.n_components)]
+        reduced_df = pd.DataFrame(X_reduced, columns=feature_names, index=df.index, copy=False)
+        if target_col and target_col in df.columns:
+            reduced_df[target_col] = df[target_col]
+        return reduced_df
     
     def reduce_dimensions(self, df, target_col=None):
         if target_col and target_col in df.columns:
             X = df.drop(columns=[target_col])
-            y = df[target_col]
         else:
             X = df
-            y = None
         
         if X.shape[1] <= self.n_components:
             return df
         
-        if self.method == 'pca':
-            self.reducer = PCA(n_components=self.n_components)
-            X_reduced = self.reducer.fit_transform(X)
-            
-            feature_names = [f'PC{i+1}' for i in range(self.n_components)]
-            reduced_df = pd.DataFrame(X_reduced, columns=feature_names, index=df.index)
-            
-            if y is not None:
-                reduced_df[target_col] = y
+        self.columns = X.columns.tolist()
+        self.reducer = self._model()
+        if self.method == 'incremental':
+            batches = gen_batches(len(X), self.chunk_size, min_batch_size=self.n_components)
+            self._partial_fit(X.iloc[rows].to_numpy(dtype=float) for rows in batches)
+        else:
+            self.reducer.fit(X)
         
-        return reduced_df
-
+        return self.transform(df, target_col)
 
 
 class FeatureEngineeringTest:
-    def __init__(self, df, original_df=None, feature_pipeline=None):
-        self.df = df
-        self.original_df = original_df
+    def __init__(self, df, original_df=None, feature_pipeline=None, sample_rows=None, random_state=42):
+        # Shallow copies: with copy-on-write, later edits to the caller's frames do
+        # not reach a report computed in the background.
+        self.df = df.copy(deep=False)
+        self.original_df = original_df.copy(deep=False) if original_df is not None else None
         self.pipeline = feature_pipeline
+        # Statistics are computed on at most sample_rows rows.
+        self.sample_rows = sample_rows
+        self.random_state = random_state
+        self.results = None
+    
+    def compute(self):
+        # Everything the report needs that scales with the data, computed once: only
+        # the target column of the correlation matrix, and no percentiles.
+        if self.results is not None:
+            return self.results
+        sample = self.df
+        if self.sample_rows and len(sample) > self.sample_rows:
+            sample = sample.sample(self.sample_rows, random_state=self.random_state)
+        numeric = sample.select_dtypes(include=np.number)
+        target_col = self.pipeline.target_col if self.pipeline else None
+        correlations = None
+        if target_col in numeric.columns:
+            correlations = numeric.drop(columns=[target_col]).corrwith(numeric[target_col]).abs().sort_values(ascending=False)
+        self.results = {
+            'rows': len(sample),
+            'sample': numeric,
+            'ranges': numeric.agg(['min', 'max', 'mean', 'std']).T,
+            'correlations': correlations,
+            'outliers': pd.Series((np.abs(stats.zscore(numeric)) > 3).sum(axis=0), index=numeric.columns),
+        }
+        return self.results
 
     def print_data_shapes(self):
         print_line("Data Shapes", "-")
@@ -259,23 +1088,27 @@ class FeatureEngineeringTest:
     def numeric_ranges_test(self):
         print_line("Numeric Feature Ranges", "-")
         print("\n")
-        numeric_cols = self.df.select_dtypes(include=np.number).columns
-        desc = self.df[numeric_cols].describe().T
-        print(desc[['min','max','mean','std']])
+        results = self.compute()
+        if results['rows'] < len(self.df):
+            print(f"(sample of {results['rows']} rows)")
+        print(results['ranges'])
 
     def feature_correlations(self, top_n=10):
         print_line("Feature Correlations with Target", "-")
-        if self.pipeline and self.pipeline.target_col in self.df.columns:
-            corr = self.df.corr()[self.pipeline.target_col].drop(self.pipeline.target_col).abs().sort_values(ascending=False)
+        corr = self.compute()['correlations']
+        if corr is not None:
             print(f"Top {top_n} features correlated with target:\n{corr.head(top_n)}\n")
         else:
             print("Target column not available.\n")
 
     def outlier_test(self, z_threshold=3):
-        print_line("Outlier Test (Z-Score > 3)", "-")
-        numeric_cols = self.df.select_dtypes(include=np.number).columns
-        z = np.abs(stats.zscore(self.df[numeric_cols]))
-        outliers = (z > z_threshold).sum()
+        print_line(f"Outlier Test (Z-Score > {z_threshold})", "-")
+        results = self.compute()
+        if z_threshold == 3:
+            outliers = results['outliers']
+        else:
+            numeric = results['sample']
+            outliers = pd.Series((np.abs(stats.zscore(numeric)) > z_threshold).sum(axis=0), index=numeric.columns)
         print(f"Number of outlier values per numeric feature:\n{outliers}\n")
 
     def run_all_tests(self):
@@ -292,7 +1125,8 @@ class FeatureEngineeringTest:
 class FeatureEngineer:
     def __init__(self, feature_type='both', manual_config=None, target_type='classification', 
                  target_col=None, selection_method='univariate', k_features=20, 
-                 apply_dimensionality_reduction=False, n_components=10):
+                 apply_dimensionality_reduction=False, n_components=10, batch_size=32, cache=None,
+                 selection_options=None, reduction_method='pca', diagnostics=False, diagnostic_rows=10000):
         self.feature_type = feature_type
         self.manual_config = manual_config or {}
         self.target_type = target_type
@@ -301,57 +1135,185 @@ class FeatureEngineer:
         self.k_features = k_features
         self.apply_dimensionality_reduction = apply_dimensionality_reduction
         self.n_components = n_components
+        self.batch_size = batch_size
+        # Report after run_pipeline: False leaves it to run_diagnostics(), True prints it
+        # inline, 'async' computes it in a background thread.
+        if diagnostics not in (False, True, 'async'):
+            raise ValueError(f"Unknown diagnostics '{diagnostics}', expected False, True or 'async'")
+        self.diagnostics = diagnostics
+        self.diagnostic_rows = diagnostic_rows
+        # A FeatureCache or a cache directory; generated features found there are read, not recomputed.
+        self.cache = FeatureCache(cache) if isinstance(cache, (str, Path)) else cache
 
-        self.auto_generator = AutoFeatureGenerator(target_type)
-        self.manual_generator = ManualFeatureGenerator(self.manual_config)
-        self.transformer = FeatureTransformer()
-        self.selector = FeatureSelector(selection_method, k_features, target_type)
-        self.reducer = DimensionalityReducer('pca', n_components)
+        self.auto_generator = AutoFeatureGenerator(target_type, cache=self.cache)
+        self.manual_generator = ManualFeatureGenerator(self.manual_config, cache=self.cache)
+        self.transformer = FeatureTransformer(cache=self.cache)
+        self.selector = FeatureSelector(selection_method, k_features, target_type, **(selection_options or {}))
+        self.reducer = DimensionalityReducer(reduction_method, n_components)
 
         self.original_features = []
         self.auto_features = []
         self.manual_features = []
         self.final_features = []
+        self.output_features = []
+        self.feature_graph = None
 
         self.tester = None
+        self.diagnostics_future = None
+
+    def _select_lazily(self, df, expressions):
+        # Scores every candidate batch by batch (base and manual columns, auto
+        # expressions and the log/scaled features derived from either) and
+        # materialises only the features that survive selection.
+        y = df[self.target_col]
+        base_cols = [col for col in df.columns if col != self.target_col]
+        manual = set(self.manual_features)
+        scores = {}
+        derived = {}
+        # df is not modified here, so column hashes are shared by every cache lookup.
+        hashes = {}
+
+        def score(frame):
+            scores.update(zip(frame.columns, self.selector.score_batch(frame, y)))
+
+        numeric_cols = set(df.select_dtypes(include=[np.number]).columns)
+        for cols in batched(base_cols, self.batch_size):
+            for col in cols:
+                if col in numeric_cols:
+                    derived[col] = self.transformer.derive(col, df[col])
+            score(df[cols].fillna(0).replace([np.inf, -np.inf], 0))
+            batch_derived = [e for col in cols for e in derived.get(col, [])]
+            if batch_derived:
+                score(evaluate_expressions(batch_derived, df, clean=True, store=self.cache, hashes=hashes))
+
+        for batch in batched(expressions, self.batch_size):
+            # Derived features are decided and computed from the raw values; the
+            # batch is cleaned in place afterwards.
+            values = expression_buffer(batch, df, store=self.cache, hashes=hashes)
+            batch_derived = []
+            for expression, column in zip(batch, values):
+                derived[expression.name] = self.transformer.derive(expression.name, column, expression)
+                batch_derived.extend(derived[expression.name])
+            if batch_derived:
+                cache = {expression.name: column for expression, column in zip(batch, values)}
+                score(evaluate_expressions(batch_derived, df, cache=cache, clean=True, store=self.cache, hashes=hashes))
+            np.nan_to_num(values, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            score(pd.DataFrame(values.T, index=df.index, columns=[e.name for e in batch], copy=False))
+
+        # Candidate order matches the eagerly built frame: original columns, auto
+        # features, manual features, then derived features in the order of their parents.
+        parents = ([col for col in base_cols if col not in manual] + [e.name for e in expressions]
+                   + [col for col in base_cols if col in manual])
+        order = parents + [e.name for parent in parents for e in derived.get(parent, [])]
+        selected = self.selector.select_scored(pd.Series([scores[name] for name in order], index=order))
+
+        graph = {e.name: e for e in expressions}
+        graph.update(self.transformer.expressions)
+        lazy = [graph[name] for name in selected if name not in df.columns]
+        result_df = pd.concat([df[[name for name in selected if name in df.columns]].fillna(0).replace([np.inf, -np.inf], 0),
+                               evaluate_expressions(lazy, df, clean=True, store=self.cache, hashes=hashes)], axis=1)
+        result_df = result_df[selected]
+        result_df[self.target_col] = y.fillna(0)
+        return result_df
 
     def run_pipeline(self, df):
         self.original_features = df.columns.tolist()
         result_df = df.copy()
+        lazy = self.target_col in df.columns and self.selection_method in FeatureSelector.BATCHED_METHODS
 
+        expressions = []
         if self.feature_type in ['auto', 'both']:
-            auto_features_df = self.auto_generator.generate_all_features(result_df)
-            if not auto_features_df.empty:
-                result_df = pd.concat([result_df, auto_features_df], axis=1)
-                self.auto_features = auto_features_df.columns.tolist()
+            expressions = self.auto_generator.generate_expressions(result_df, self.target_col)
+            self.auto_features = [e.name for e in expressions]
+            if expressions and not lazy:
+                result_df = pd.concat([result_df, evaluate_expressions(expressions, result_df, store=self.cache)], axis=1)
 
         if self.feature_type in ['manual', 'both'] and self.manual_config.get("manual_features", {}):
             result_df = self.manual_generator.create_features(result_df)
             self.manual_features = self.manual_generator.created_features
 
-        result_df = self.transformer.apply_transformations(result_df)
-        result_df = result_df.fillna(0)
-        result_df = result_df.replace([np.inf, -np.inf], 0)
-
-        if self.target_col:
-            result_df = self.selector.select_features(result_df, self.target_col)
+        if lazy:
+            result_df = self._select_lazily(result_df, expressions)
             self.final_features = self.selector.selected_features
-            if self.apply_dimensionality_reduction:
-                result_df = self.reducer.reduce_dimensions(result_df, self.target_col)
+        else:
+            result_df = self.transformer.apply_transformations(result_df, exclude=[self.target_col])
+            result_df = result_df.fillna(0)
+            result_df = result_df.replace([np.inf, -np.inf], 0)
+            if self.target_col:
+                result_df = self.selector.select_features(result_df, self.target_col)
+                self.final_features = self.selector.selected_features
+
+        # Expression graph of the output: what transform() needs to rebuild exactly
+        # these features, and nothing that selection dropped.
+        self.output_features = [col for col in result_df.columns if col != self.target_col]
+        graph = {e.name: e for e in expressions}
+        graph.update(self.transformer.expressions)
+        self.feature_graph = {}
+        pending = list(self.output_features)
+        while pending:
+            name = pending.pop()
+            if name in graph and name not in self.original_features and name not in self.feature_graph:
+                self.feature_graph[name] = graph[name]
+                pending.extend(graph[name].columns())
+
+        if self.target_col and self.apply_dimensionality_reduction:
+            result_df = self.reducer.reduce_dimensions(result_df, self.target_col)
+        if self.cache is not None:
+            self.cache.evict()
+
+        self.tester = FeatureEngineeringTest(df=result_df, original_df=df, feature_pipeline=self,
+                                             sample_rows=self.diagnostic_rows)
+        self.diagnostics_future = None
+        if self.diagnostics == 'async':
+            executor = ThreadPoolExecutor(max_workers=1)
+            self.diagnostics_future = executor.submit(self.tester.compute)
+            executor.shutdown(wait=False)
+        elif self.diagnostics:
+            self.tester.run_all_tests()
 
-        self.tester = FeatureEngineeringTest(df=result_df, original_df=df, feature_pipeline=self)
+        return result_df
+
+    def run_diagnostics(self):
+        # Prints the report for the last run_pipeline, waiting for a background run if any.
+        if self.tester is None:
+            raise ValueError("run_pipeline must be called before run_diagnostics")
+        if self.diagnostics_future is not None:
+            self.diagnostics_future.result()
         self.tester.run_all_tests()
+        return self.tester.results
+
+    def transform(self, df):
+        # Rebuilds only the output features for new data from the recorded graph.
+        if self.feature_graph is None:
+            raise ValueError("run_pipeline must be called before transform")
+        referenced = set(self.output_features).union(*(e.columns() for e in self.feature_graph.values()))
+        manual = [name for name in self.manual_features if name in referenced]
+        base = df.assign(**self.manual_generator.evaluate(df, manual)) if manual else df
+
+        lazy = [self.feature_graph[name] for name in self.output_features if name in self.feature_graph]
+        result_df = pd.concat([base[[name for name in self.output_features if name not in self.feature_graph]],
+                               evaluate_expressions(lazy, base, graph=self.feature_graph, store=self.cache)], axis=1)
+        result_df = result_df[self.output_features].fillna(0).replace([np.inf, -np.inf], 0)
+        if self.target_col in df.columns:
+            result_df[self.target_col] = df[self.target_col].fillna(0)
 
+        if self.apply_dimensionality_reduction and self.reducer.reducer is not None:
+            result_df = self.reducer.transform(result_df, self.target_col)
+        if self.cache is not None:
+            self.cache.evict()
         return result_df
 
     def get_feature_info(self):
-        return {
+        info = {
             'original_features': len(self.original_features),
             'auto_features': len(self.auto_features),
             'manual_features': len(self.manual_features),
             'final_features': len(self.final_features),
             'selected_features': self.final_features
         }
+        if self.cache is not None:
+            info['cache'] = self.cache.stats()
+        return info
 
 
 
@@ -378,4 +1340,5 @@ if __name__ == "__main__":
 
 
     engineered_data = pipeline.run_pipeline(sample_data)
+    pipeline.run_diagnostics()
     feature_info = pipeline.get_feature_info()
@@ -4,18 +4,33 @@ from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, Ma
 from sklearn.impute import SimpleImputer, KNNImputer
 from sklearn.ensemble import IsolationForest
 from sklearn.cluster import DBSCAN
-from sklearn.neighbors import LocalOutlierFactor
+from sklearn.neighbors import LocalOutlierFactor, NearestNeighbors
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, OrdinalEncoder
+from sklearn.preprocessing import LabelEncoder, OrdinalEncoder
 from sklearn.decomposition import PCA
 from imblearn.over_sampling import SMOTE, ADASYN, BorderlineSMOTE
 from imblearn.under_sampling import RandomUnderSampler, TomekLinks
 from imblearn.combine import SMOTEENN, SMOTETomek
-from scipy import stats
-from scipy.stats import boxcox, yeojohnson
+from imblearn.utils import check_sampling_strategy
+from scipy import stats, sparse, special
 import warnings
 import shutil
+import copy
+import os
+import sys
+import time
+import cProfile
+import pstats
+import io
+import tracemalloc
+from contextlib import contextmanager
+import json
+import pickle
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
 warnings.filterwarnings('ignore')
 
 def get_line(title="", char="=", width=None):
@@ -26,85 +41,452 @@ def get_line(title="", char="=", width=None):
     else:
         return char * width
 
+@contextmanager
+def timed(timings, key):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[key] = timings.get(key, 0.0) + time.perf_counter() - start
+
+def float_dtype(dtype):
+    return np.dtype(np.float64 if dtype is None else dtype)
+
+def cast_floats(df, dtype, copy=False):
+    # Casts dense float columns to dtype; integer, categorical, object and
+    # sparse columns keep their dtype. dtype=None leaves the frame as it is.
+    # With copy=True a new frame is returned and the float columns are
+    # converted straight into it rather than copied first.
+    if dtype is None:
+        return df.copy() if copy else df
+    dtype = np.dtype(dtype)
+    float_cols = [col for col, col_dtype in df.dtypes.items()
+                  if isinstance(col_dtype, np.dtype) and col_dtype.kind == 'f' and col_dtype != dtype]
+    if copy:
+        return df.astype({col: dtype for col in float_cols})
+    if float_cols:
+        df[float_cols] = df[float_cols].astype(dtype)
+    return df
+
+def check_float32_precision(df):
+    # float32 carries ~7 significant digits (eps 1.19e-07), so scaled and
+    # imputed values agree with float64 to about 1e-6 relative; beyond 3.4e38 a
+    # value becomes inf and integers above 2**24 are no longer exact. Overflow
+    # is an error, inexact integer columns are only reported.
+    numeric = df.select_dtypes(include=[np.number])
+    max_abs = numeric.abs().max()
+    overflow = list(max_abs[max_abs > np.finfo(np.float32).max].index)
+    if overflow:
+        raise ValueError(f"Columns {overflow} exceed the float32 range; use dtype='float64'")
+    integer_cols = numeric.select_dtypes(include=['integer']).columns
+    inexact = [col for col in integer_cols if max_abs[col] > 2 ** 24]
+    return {'dtype': 'float32', 'relative_precision': float(np.finfo(np.float32).eps),
+            'inexact_integer_columns': inexact}
+
+def stable_hash(values):
+    # Seeded SipHash over the string form of each value, so codes agree across
+    # processes regardless of PYTHONHASHSEED.
+    return pd.util.hash_array(np.asarray(values).astype(str).astype(object))
+
+def parallel_map(func, items, n_jobs=1, use_processes=False):
+    items = list(items)
+    if n_jobs is None or n_jobs in (0, 1) or len(items) <= 1:
+        return [func(*item) for item in items]
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(max_workers=min(n_jobs, len(items))) as executor:
+        return list(executor.map(func, *zip(*items)))
+
+_partition_worker = {}
+
+def _attach_block(spec):
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    return shm, np.ndarray(spec['shape'], dtype=spec['dtype'], buffer=shm.buf)
+
+def _init_partition_worker(handlers, input_spec, output_spec):
+    # Runs once per worker process: the fitted handlers arrive with the pool and
+    # both float blocks are mapped from shared memory instead of being pickled.
+    _partition_worker['handlers'] = handlers
+    _partition_worker['input'] = _attach_block(input_spec)
+    _partition_worker['output'] = _attach_block(output_spec)
+    _partition_worker['input_cols'] = input_spec['columns']
+    _partition_worker['output_cols'] = output_spec['columns']
+
+def _transform_partition(start, stop, other, columns):
+    index = pd.RangeIndex(start, stop)
+    part = pd.DataFrame(_partition_worker['input'][1][start:stop], columns=_partition_worker['input_cols'], index=index)
+    part = pd.concat([part, other.set_axis(index)], axis=1)[columns]
+    for handler in _partition_worker['handlers']:
+        part = handler.transform(part)
+    
+    output_cols = _partition_worker['output_cols']
+    output_block = _partition_worker['output'][1]
+    output_block[start:stop] = part[output_cols].to_numpy(dtype=output_block.dtype)
+    return part.drop(columns=output_cols)
+
+def parallel_transform(handlers, df, n_jobs=-1, partition_rows=None, dtype=None):
+    # Applies fitted handlers to row partitions in a process pool. Float input
+    # and output columns live in shared memory (float64, or dtype when given)
+    # and each worker writes its rows in place; only the remaining (object,
+    # categorical, integer) columns are pickled per partition. The output
+    # layout comes from a probe on the first rows.
+    if n_jobs is None or n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    partition_rows = partition_rows or int(np.ceil(len(df) / n_jobs))
+    
+    probe = df.iloc[:min(len(df), 1000)].copy()
+    for handler in handlers:
+        probe = handler.transform(probe)
+    block_dtype = float_dtype(dtype)
+    input_cols = [col for col, col_dtype in df.dtypes.items() if col_dtype in (np.float64, block_dtype)]
+    output_cols = [col for col, col_dtype in probe.dtypes.items() if col_dtype == block_dtype]
+    other_cols = [col for col in df.columns if col not in input_cols]
+    
+    blocks = []
+    try:
+        for cols in (input_cols, output_cols):
+            size = max(len(df) * len(cols) * block_dtype.itemsize, 1)
+            blocks.append(shared_memory.SharedMemory(create=True, size=size))
+        input_block = np.ndarray((len(df), len(input_cols)), dtype=block_dtype, buffer=blocks[0].buf)
+        input_block[:] = df[input_cols].to_numpy(dtype=block_dtype)
+        output_block = np.ndarray((len(df), len(output_cols)), dtype=block_dtype, buffer=blocks[1].buf)
+        
+        input_spec = {'name': blocks[0].name, 'shape': input_block.shape, 'dtype': block_dtype, 'columns': input_cols}
+        output_spec = {'name': blocks[1].name, 'shape': output_block.shape, 'dtype': block_dtype, 'columns': output_cols}
+        starts = range(0, len(df), partition_rows)
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(starts)), initializer=_init_partition_worker,
+                                 initargs=(handlers, input_spec, output_spec)) as executor:
+            futures = [executor.submit(_transform_partition, start, min(start + partition_rows, len(df)),
+                                       df[other_cols].iloc[start:start + partition_rows], list(df.columns))
+                       for start in starts]
+            others = [future.result() for future in futures]
+        
+        result = pd.DataFrame(output_block.copy(), columns=output_cols)
+        result = pd.concat([result, pd.concat(others)], axis=1)[list(probe.columns)]
+        result.index = df.index
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def fit_target_encoding(values, y, folds, n_folds, smoothing):
+    # All folds come out of one bincount per statistic: out-of-fold sums are
+    # the column totals minus the in-fold sums.
+    codes, categories = pd.factorize(values, sort=True)
+    n_categories = len(categories)
+    valid = codes >= 0
+    
+    keys = folds[valid] * n_categories + codes[valid]
+    fold_sums = np.bincount(keys, weights=y[valid], minlength=n_folds * n_categories).reshape(n_folds, n_categories)
+    fold_counts = np.bincount(keys, minlength=n_folds * n_categories).reshape(n_folds, n_categories)
+    total_sums = fold_sums.sum(axis=0)
+    total_counts = fold_counts.sum(axis=0)
+    
+    fold_y_sums = np.bincount(folds, weights=y, minlength=n_folds)
+    fold_sizes = np.bincount(folds, minlength=n_folds)
+    prior = y.mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        oof_priors = (y.sum() - fold_y_sums) / (len(y) - fold_sizes)
+    oof_priors = np.where(np.isfinite(oof_priors), oof_priors, prior)
+    
+    oof_counts = total_counts - fold_counts + smoothing
+    oof_table = np.divide((total_sums - fold_sums) + smoothing * oof_priors[:, None], oof_counts,
+                          out=np.repeat(oof_priors[:, None], n_categories, axis=1), where=oof_counts > 0)
+    encoded = np.where(valid, oof_table[folds, np.maximum(codes, 0)], oof_priors[folds])
+    
+    full_counts = total_counts + smoothing
+    mapping = np.divide(total_sums + smoothing * prior, full_counts,
+                        out=np.full(n_categories, prior), where=full_counts > 0)
+    return encoded, {'categories': categories, 'values': mapping, 'prior': prior}
+
+def update_moments(moments, values):
+    # Merges a block into running per-column (count, mean, M2, M3) with the
+    # pairwise update of Chan et al. / Pebay, ignoring NaNs.
+    mask = ~np.isnan(values)
+    n_b = mask.sum(axis=0).astype(float)
+    mean_b = np.nansum(values, axis=0) / np.maximum(n_b, 1)
+    centered = np.where(mask, values - mean_b, 0.0)
+    m2_b = (centered ** 2).sum(axis=0)
+    m3_b = (centered ** 3).sum(axis=0)
+    if moments is None:
+        return {'n': n_b, 'mean': mean_b, 'm2': m2_b, 'm3': m3_b}
+    
+    n_a, mean_a, m2_a, m3_a = moments['n'], moments['mean'], moments['m2'], moments['m3']
+    n = n_a + n_b
+    safe_n = np.maximum(n, 1)
+    delta = mean_b - mean_a
+    return {
+        'n': n,
+        'mean': mean_a + delta * n_b / safe_n,
+        'm2': m2_a + m2_b + delta ** 2 * n_a * n_b / safe_n,
+        'm3': (m3_a + m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / safe_n ** 2
+               + 3 * delta * (n_a * m2_b - n_b * m2_a) / safe_n)
+    }
+
+def merge_counts(counts, values):
+    new_counts = pd.Series(values).value_counts()
+    if counts is None:
+        return new_counts
+    return counts.add(new_counts, fill_value=0)
+
 class MissingValueHandler:
-    def __init__(self, strategy_config):
+    def __init__(self, strategy_config, copy=True, dtype=None):
         self.strategy_config = strategy_config
+        self.copy = copy
+        self.dtype = dtype
         self.imputers = {}
+        self.timings = {}
+        self.fill_values = {}
+        self.dropped_columns = []
+        self.sketches = {}
+        self.value_counts = {}
+        self.sums = {}
+        self.null_counts = None
+        self.n_rows = 0
         
     def fit_transform(self, X, y=None, problem_type=None):
-        X_imputed = X.copy()
+        X_imputed = X.copy() if self.copy else X
         
         if 'drop_high_missing' in self.strategy_config:
-            threshold = self.strategy_config['drop_high_missing'].get('threshold', 0.5)
-            missing_ratio = X_imputed.isnull().sum() / len(X_imputed)
-            cols_to_drop = missing_ratio[missing_ratio > threshold].index
-            X_imputed = X_imputed.drop(columns=cols_to_drop)
+            with timed(self.timings, 'drop_high_missing'):
+                threshold = self.strategy_config['drop_high_missing'].get('threshold', 0.5)
+                missing_ratio = X_imputed.isnull().sum() / len(X_imputed)
+                cols_to_drop = missing_ratio[missing_ratio > threshold].index
+                X_imputed = X_imputed.drop(columns=cols_to_drop)
+                self.dropped_columns = list(cols_to_drop)
         
         if 'constant' in self.strategy_config:
-            for col in self.strategy_config['constant']:
-                fill_val = self.strategy_config.get('fill_value', 0)
-                X_imputed[col] = X_imputed[col].fillna(fill_val)
+            with timed(self.timings, 'constant'):
+                for col in self.strategy_config['constant']:
+                    fill_val = self.strategy_config.get('fill_value', 0)
+                    X_imputed[col] = X_imputed[col].fillna(fill_val)
         
         if 'mean' in self.strategy_config:
-            for col in self.strategy_config['mean']:
-                if col in X_imputed.columns:
-                    imputer = SimpleImputer(strategy='mean')
-                    X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
-                    self.imputers[f'{col}_mean'] = imputer
+            with timed(self.timings, 'mean'):
+                for col in self.strategy_config['mean']:
+                    if col in X_imputed.columns:
+                        imputer = SimpleImputer(strategy='mean')
+                        X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
+                        self.imputers[f'{col}_mean'] = imputer
+                        self.fill_values[f'{col}_mean'] = imputer.statistics_[0]
         
         if 'median' in self.strategy_config:
-            for col in self.strategy_config['median']:
-                if col in X_imputed.columns:
-                    imputer = SimpleImputer(strategy='median')
-                    X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
-                    self.imputers[f'{col}_median'] = imputer
+            with timed(self.timings, 'median'):
+                for col in self.strategy_config['median']:
+                    if col in X_imputed.columns:
+                        imputer = SimpleImputer(strategy='median')
+                        X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
+                        self.imputers[f'{col}_median'] = imputer
+                        self.fill_values[f'{col}_median'] = imputer.statistics_[0]
         
         if 'mode' in self.strategy_config:
-            for col in self.strategy_config['mode']:
-                if col in X_imputed.columns:
-                    imputer = SimpleImputer(strategy='most_frequent')
-                    X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
-                    self.imputers[f'{col}_mode'] = imputer
+            with timed(self.timings, 'mode'):
+                for col in self.strategy_config['mode']:
+                    if col in X_imputed.columns:
+                        imputer = SimpleImputer(strategy='most_frequent')
+                        X_imputed[col] = imputer.fit_transform(X_imputed[[col]]).ravel()
+                        self.imputers[f'{col}_mode'] = imputer
+                        self.fill_values[f'{col}_mode'] = imputer.statistics_[0]
         
         if 'knn' in self.strategy_config:
-            numeric_cols = self.strategy_config['knn']
-            if numeric_cols:
-                n_neighbors = self.strategy_config.get('n_neighbors', 5)
-                knn_imputer = KNNImputer(n_neighbors=n_neighbors)
-                X_imputed[numeric_cols] = knn_imputer.fit_transform(X_imputed[numeric_cols])
-                self.imputers['knn'] = knn_imputer
+            with timed(self.timings, 'knn'):
+                numeric_cols = self.strategy_config['knn']
+                if numeric_cols:
+                    n_neighbors = self.strategy_config.get('n_neighbors', 5)
+                    knn_imputer = KNNImputer(n_neighbors=n_neighbors)
+                    X_imputed[numeric_cols] = knn_imputer.fit_transform(X_imputed[numeric_cols])
+                    self.imputers['knn'] = knn_imputer
         
         if 'iterative' in self.strategy_config:
-            numeric_cols = self.strategy_config['iterative']
-            if numeric_cols:
-                iter_imputer = IterativeImputer(random_state=42)
-                X_imputed[numeric_cols] = iter_imputer.fit_transform(X_imputed[numeric_cols])
-                self.imputers['iterative'] = iter_imputer
+            with timed(self.timings, 'iterative'):
+                numeric_cols = self.strategy_config['iterative']
+                if numeric_cols:
+                    iter_imputer = IterativeImputer(random_state=42)
+                    X_imputed[numeric_cols] = iter_imputer.fit_transform(X_imputed[numeric_cols])
+                    self.imputers['iterative'] = iter_imputer
         
         if 'forward_fill' in self.strategy_config:
-            for col in self.strategy_config['forward_fill']:
-                X_imputed[col] = X_imputed[col].fillna(method='ffill')
+            with timed(self.timings, 'forward_fill'):
+                for col in self.strategy_config['forward_fill']:
+                    X_imputed[col] = X_imputed[col].fillna(method='ffill')
         
         if 'backward_fill' in self.strategy_config:
-            for col in self.strategy_config['backward_fill']:
-                X_imputed[col] = X_imputed[col].fillna(method='bfill')
+            with timed(self.timings, 'backward_fill'):
+                for col in self.strategy_config['backward_fill']:
+                    X_imputed[col] = X_imputed[col].fillna(method='bfill')
         
         if 'interpolate' in self.strategy_config:
-            for col in self.strategy_config['interpolate']:
-                method = self.strategy_config['interpolate'].get('method', 'linear')
-                X_imputed[col] = X_imputed[col].interpolate(method=method)
+            with timed(self.timings, 'interpolate'):
+                for col in self.strategy_config['interpolate']:
+                    method = self.strategy_config['interpolate'].get('method', 'linear')
+                    X_imputed[col] = X_imputed[col].interpolate(method=method)
         
-        return X_imputed
+        return cast_floats(X_imputed, self.dtype)
+    
+    def partial_fit(self, X):
+        if self.strategy_config.get('knn') or self.strategy_config.get('iterative'):
+            raise ValueError("KNN and iterative imputation need the full dataset and cannot be fitted in chunks")
+        
+        self.n_rows += len(X)
+        null_counts = X.isnull().sum()
+        self.null_counts = null_counts if self.null_counts is None else self.null_counts.add(null_counts, fill_value=0)
+        if 'drop_high_missing' in self.strategy_config:
+            threshold = self.strategy_config['drop_high_missing'].get('threshold', 0.5)
+            missing_ratio = self.null_counts / self.n_rows
+            self.dropped_columns = list(missing_ratio[missing_ratio > threshold].index)
+        
+        for col in self.strategy_config.get('mean', []):
+            if col in X.columns:
+                values = X[col].to_numpy(dtype=float)
+                total, count = self.sums.get(col, (0.0, 0))
+                total, count = total + np.nansum(values), count + np.count_nonzero(~np.isnan(values))
+                self.sums[col] = (total, count)
+                self.fill_values[f'{col}_mean'] = total / count if count else np.nan
+        
+        for col in self.strategy_config.get('median', []):
+            if col in X.columns:
+                if col not in self.sketches:
+                    self.sketches[col] = QuantileSketch()
+                self.sketches[col].update(X[col].to_numpy(dtype=float))
+                self.fill_values[f'{col}_median'] = float(self.sketches[col].quantile(0.5))
+        
+        for col in self.strategy_config.get('mode', []):
+            if col in X.columns:
+                self.value_counts[col] = merge_counts(self.value_counts.get(col), X[col])
+                counts = self.value_counts[col]
+                # Ties resolve to the smallest value, as SimpleImputer does.
+                self.fill_values[f'{col}_mode'] = counts.index[counts == counts.max()].sort_values()[0]
+        
+        return self
+    
+    def transform(self, X):
+        X_imputed = X.copy() if self.copy else X
+        
+        dropped = [col for col in self.dropped_columns if col in X_imputed.columns]
+        if dropped:
+            X_imputed = X_imputed.drop(columns=dropped)
+        
+        if 'constant' in self.strategy_config:
+            for col in self.strategy_config['constant']:
+                if col in X_imputed.columns:
+                    X_imputed[col] = X_imputed[col].fillna(self.strategy_config.get('fill_value', 0))
+        
+        for strategy in ('mean', 'median', 'mode'):
+            for col in self.strategy_config.get(strategy, []):
+                if col in X_imputed.columns and f'{col}_{strategy}' in self.fill_values:
+                    X_imputed[col] = X_imputed[col].fillna(self.fill_values[f'{col}_{strategy}'])
+        
+        for strategy in ('knn', 'iterative'):
+            numeric_cols = self.strategy_config.get(strategy)
+            if numeric_cols and strategy in self.imputers:
+                X_imputed[numeric_cols] = self.imputers[strategy].transform(X_imputed[numeric_cols])
+        
+        # Row-dependent fills only see the rows of the frame being transformed.
+        for col in self.strategy_config.get('forward_fill', []):
+            X_imputed[col] = X_imputed[col].ffill()
+        for col in self.strategy_config.get('backward_fill', []):
+            X_imputed[col] = X_imputed[col].bfill()
+        for col in self.strategy_config.get('interpolate', []):
+            X_imputed[col] = X_imputed[col].interpolate(method='linear')
+        
+        return cast_floats(X_imputed, self.dtype)
+
+class QuantileSketch:
+    # KLL-style mergeable quantile sketch: level h holds items of weight 2**h and
+    # each level is compacted (sorted, every other item promoted) once it exceeds
+    # its capacity, so memory stays around k / (1 - c) items for any stream length.
+    def __init__(self, k=200, c=2 / 3, random_state=42):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+    
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * self.c ** depth)))
+    
+    def _compress(self):
+        while True:
+            level = next((h for h, items in enumerate(self.compactors) if items.size > self._capacity(h)), None)
+            if level is None:
+                return
+            if level + 1 == len(self.compactors):
+                self.compactors.append(np.empty(0))
+            items = np.sort(self.compactors[level])
+            leftover = items[-1:] if items.size % 2 else items[:0]
+            paired = items[:items.size - leftover.size]
+            promoted = paired[self._rng.integers(2)::2]
+            self.compactors[level] = leftover
+            self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+    
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.n += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+        return self
+    
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+    
+    def quantile(self, q):
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        if len(self.compactors) == 1:
+            # Nothing has been compacted yet, so the sketch still holds every value exactly.
+            return np.percentile(self.compactors[0], q * 100)
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(level_items.size, 2.0 ** level) for level, level_items in enumerate(self.compactors)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cum_weights = np.cumsum(weights[order])
+        idx = np.searchsorted(cum_weights, q * cum_weights[-1], side='left')
+        result = items[np.clip(idx, 0, items.size - 1)]
+        return np.clip(result, self.min, self.max)
 
 class OutlierHandler:
-    def __init__(self, method, threshold=3, action='cap', columns=None, percentile_low=0.05, percentile_high=0.95):
+    def __init__(self, method, threshold=3, action='cap', columns=None, percentile_low=0.05, percentile_high=0.95,
+                 approximate=False, sketch_size=200, copy=True, dtype=None):
         self.method = method
         self.threshold = threshold
         self.action = action
         self.columns = columns
         self.percentile_low = percentile_low
         self.percentile_high = percentile_high
+        self.approximate = approximate
+        self.sketch_size = sketch_size
+        self.copy = copy
+        self.dtype = dtype
+        self.sketches = {}
         self.stats_dict = {}
+        self.timings = {}
+    
+    def _quantiles(self, X, quantiles):
+        if self.approximate:
+            sketch = self.sketches.get(X.name)
+            if sketch is None:
+                sketch = QuantileSketch(k=self.sketch_size).update(X)
+            return sketch.quantile(quantiles)
+        return np.percentile(X, np.asarray(quantiles) * 100)
     
     def detect_outliers_zscore(self, X):
         z_scores = np.abs(stats.zscore(X))
@@ -117,8 +499,7 @@ class OutlierHandler:
         return np.abs(modified_z_scores) > self.threshold
     
     def detect_outliers_iqr(self, X):
-        Q1 = np.percentile(X, 25)
-        Q3 = np.percentile(X, 75)
+        Q1, Q3 = self._quantiles(X, [0.25, 0.75])
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
@@ -134,229 +515,760 @@ class OutlierHandler:
         outliers = lof.fit_predict(X)
         return outliers == -1
     
-    def fit_transform(self, X):
-        X_processed = X.copy()
-        
+    def _target_columns(self, X):
         if self.columns is None:
-            numeric_cols = X.select_dtypes(include=[np.number]).columns
-        else:
-            numeric_cols = [col for col in self.columns if col in X.columns]
+            return X.select_dtypes(include=[np.number]).columns
+        return [col for col in self.columns if col in X.columns]
+    
+    def _update_caps(self, col):
+        lower_cap, upper_cap = self.sketches[col].quantile([self.percentile_low, self.percentile_high])
+        self.stats_dict[col] = {'lower_cap': lower_cap, 'upper_cap': upper_cap}
+    
+    def partial_fit(self, X):
+        for col in self._target_columns(X):
+            if col not in self.sketches:
+                self.sketches[col] = QuantileSketch(k=self.sketch_size)
+            self.sketches[col].update(X[col].to_numpy())
+            if self.action == 'cap':
+                self._update_caps(col)
+        return self
+    
+    def merge(self, other):
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = copy.deepcopy(sketch)
+            if self.action == 'cap':
+                self._update_caps(col)
+        return self
+    
+    def transform(self, X):
+        X_processed = X.copy() if self.copy else X
+        
+        if self.action == 'cap':
+            for col, caps in self.stats_dict.items():
+                if col in X_processed.columns:
+                    X_processed[col] = np.clip(X_processed[col], caps['lower_cap'], caps['upper_cap'])
+        elif self.action == 'transform_log':
+            for col in self._target_columns(X_processed):
+                X_processed[col] = np.log1p(X_processed[col])
+        
+        return cast_floats(X_processed, self.dtype)
+    
+    def fit_transform(self, X):
+        X_processed = X.copy() if self.copy else X
+        numeric_cols = self._target_columns(X)
         
         for col in numeric_cols:
-            if self.method == 'zscore':
-                outliers = self.detect_outliers_zscore(X[col])
-            elif self.method == 'modified_zscore':
-                outliers = self.detect_outliers_modified_zscore(X[col])
-            elif self.method == 'iqr':
-                outliers = self.detect_outliers_iqr(X[col])
-            elif self.method == 'isolation_forest':
-                outliers = self.detect_outliers_isolation_forest(X[[col]])
-            elif self.method == 'lof':
-                outliers = self.detect_outliers_lof(X[[col]])
-            else:
-                continue
+            if self.approximate:
+                self.sketches[col] = QuantileSketch(k=self.sketch_size).update(X[col].to_numpy())
             
-            if self.action == 'remove':
-                X_processed = X_processed[~outliers]
-            elif self.action == 'cap':
-                lower_cap = np.percentile(X[col], self.percentile_low * 100)
-                upper_cap = np.percentile(X[col], self.percentile_high * 100)
-                X_processed[col] = np.clip(X_processed[col], lower_cap, upper_cap)
-                self.stats_dict[col] = {'lower_cap': lower_cap, 'upper_cap': upper_cap}
-            elif self.action == 'transform_log':
-                X_processed[col] = np.log1p(X_processed[col])
+            with timed(self.timings, self.method):
+                if self.method == 'zscore':
+                    outliers = self.detect_outliers_zscore(X[col])
+                elif self.method == 'modified_zscore':
+                    outliers = self.detect_outliers_modified_zscore(X[col])
+                elif self.method == 'iqr':
+                    outliers = self.detect_outliers_iqr(X[col])
+                elif self.method == 'isolation_forest':
+                    outliers = self.detect_outliers_isolation_forest(X[[col]])
+                elif self.method == 'lof':
+                    outliers = self.detect_outliers_lof(X[[col]])
+                else:
+                    continue
+            
+            with timed(self.timings, self.action):
+                if self.action == 'remove':
+                    X_processed = X_processed[~outliers]
+                elif self.action == 'cap':
+                    lower_cap, upper_cap = self._quantiles(X[col], [self.percentile_low, self.percentile_high])
+                    X_processed[col] = np.clip(X_processed[col], lower_cap, upper_cap)
+                    self.stats_dict[col] = {'lower_cap': lower_cap, 'upper_cap': upper_cap}
+                elif self.action == 'transform_log':
+                    X_processed[col] = np.log1p(X_processed[col])
         
-        return X_processed
+        return cast_floats(X_processed, self.dtype)
 
 class CategoricalEncoder:
-    def __init__(self, encoding_config):
+    def __init__(self, encoding_config, copy=True, dtype=None):
         self.encoding_config = encoding_config
+        self.copy = copy
+        self.dtype = dtype
         self.encoders = {}
+        self.timings = {}
+        self.category_counts = {}
+        self.null_counts = {}
+        self.target_sums = {}
+        self.target_total = (0.0, 0)
+    
+    def _select_onehot_categories(self, uniques, counts):
+        max_categories = self.encoding_config.get('onehot_max_categories')
+        if max_categories and len(uniques) > max_categories:
+            keep = np.sort(np.argsort(-counts, kind='stable')[:max_categories])
+            return keep, True
+        return None, False
+    
+    def _fit_onehot_categories(self, values):
+        codes, uniques = pd.factorize(values, sort=True, use_na_sentinel=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        keep, has_other = self._select_onehot_categories(uniques, counts)
+        
+        if has_other:
+            code_map = np.full(len(uniques), len(keep))
+            code_map[keep] = np.arange(len(keep))
+            return uniques[keep], True, code_map[codes]
+        return uniques, False, codes
+    
+    def _encode_onehot(self, X, columns, fit=True):
+        names, row_idx, col_idx = [], [], []
+        offset = 0
+        
+        for col in columns:
+            if fit:
+                categories, has_other, codes = self._fit_onehot_categories(X[col])
+                self.encoders[f'{col}_onehot'] = {'categories': categories, 'other': has_other}
+            else:
+                fitted = self.encoders[f'{col}_onehot']
+                categories, has_other = fitted['categories'], fitted['other']
+                codes = pd.Index(categories).get_indexer(X[col])
+                if has_other:
+                    codes[codes < 0] = len(categories)
+            
+            width = len(categories) + int(has_other)
+            names.extend(f"{col}_{cat}" for cat in categories)
+            if has_other:
+                names.append(f"{col}_other")
+            rows = np.flatnonzero(codes >= 0)
+            row_idx.append(rows)
+            col_idx.append(codes[rows] + offset)
+            offset += width
+        
+        encoded_df = self._indicator_frame(X.index, names, row_idx, col_idx,
+                                           self.encoding_config.get('onehot_sparse', False))
+        return pd.concat([X.drop(columns=columns), encoded_df], axis=1)
+    
+    def _indicator_frame(self, index, names, row_idx, col_idx, as_sparse):
+        row_idx = np.concatenate(row_idx)
+        col_idx = np.concatenate(col_idx)
+        if as_sparse:
+            matrix = sparse.csc_matrix((np.ones(len(row_idx), dtype=float_dtype(self.dtype)), (row_idx, col_idx)),
+                                       shape=(len(index), len(names)))
+            encoded_df = pd.DataFrame({name: pd.arrays.SparseArray.from_spmatrix(matrix[:, [j]])
+                                       for j, name in enumerate(names)})
+            encoded_df.index = index
+            return encoded_df
+        matrix = np.zeros((len(index), len(names)), dtype=float_dtype(self.dtype))
+        matrix[row_idx, col_idx] = 1.0
+        return pd.DataFrame(matrix, columns=names, index=index)
+    
+    def _encode_binary(self, X, columns, fit=True):
+        blocks, names = [], []
+        
+        for col in columns:
+            if fit:
+                codes, categories = pd.factorize(X[col], sort=True, use_na_sentinel=False)
+                self.encoders[f'{col}_binary'] = categories
+            else:
+                categories = self.encoders[f'{col}_binary']
+                codes = pd.Index(categories).get_indexer(X[col])
+            # Code 0 is reserved for categories unseen during fit.
+            codes = codes.astype(np.int64) + 1
+            n_bits = max(1, int(np.ceil(np.log2(len(categories) + 1))))
+            # Bits are 0/1: one byte each in the reduced-memory (dtype) mode, int64 otherwise.
+            bits = (codes[:, None] >> np.arange(n_bits)) & 1
+            blocks.append(bits if self.dtype is None else bits.astype(np.uint8))
+            names.extend(f"{col}_bit_{i}" for i in range(n_bits))
+        
+        encoded_df = pd.DataFrame(np.hstack(blocks), columns=names, index=X.index)
+        return pd.concat([X.drop(columns=columns), encoded_df], axis=1)
+    
+    def _encode_hashing(self, X, columns):
+        n_features = self.encoding_config.get('hash_n_features', 32)
+        names, row_idx, col_idx = [], [], []
+        
+        for i, col in enumerate(columns):
+            codes, uniques = pd.factorize(X[col], use_na_sentinel=False)
+            buckets = (stable_hash(uniques) % np.uint64(n_features)).astype(np.int64)
+            names.extend(f"{col}_hash_{b}" for b in range(n_features))
+            row_idx.append(np.arange(len(X)))
+            col_idx.append(buckets[codes] + i * n_features)
+        
+        encoded_df = self._indicator_frame(X.index, names, row_idx, col_idx,
+                                           self.encoding_config.get('hash_sparse', False))
+        return pd.concat([X.drop(columns=columns), encoded_df], axis=1)
+    
+    def _encode_target(self, X, y, columns):
+        n_folds = self.encoding_config.get('target_folds', 5)
+        smoothing = self.encoding_config.get('target_smoothing', 10)
+        y_values = X[y.name] if y.name in X.columns else y
+        y_values = np.asarray(y_values, dtype=float)
+        folds = np.random.default_rng(42).permutation(len(X)) % n_folds
+        
+        results = parallel_map(
+            fit_target_encoding,
+            [(X[col], y_values, folds, n_folds, smoothing) for col in columns],
+            n_jobs=self.encoding_config.get('n_jobs', 1)
+        )
+        for col, (encoded, target_map) in zip(columns, results):
+            X[col] = encoded
+            self.encoders[f'{col}_target'] = target_map
+        return X
+    
+    def _counted_categories(self, col):
+        # Sorted categories with NaN last, matching pd.factorize(sort=True, use_na_sentinel=False);
+        # categorical columns count their unused categories too, so those are dropped.
+        counts = self.category_counts[col]
+        counts = counts[counts > 0].sort_index()
+        uniques, counts = counts.index, counts.to_numpy()
+        if self.null_counts[col]:
+            uniques = uniques.append(pd.Index([np.nan]))
+            counts = np.append(counts, self.null_counts[col])
+        return uniques, counts
+    
+    def partial_fit(self, X, y=None):
+        y_values = None
+        if y is not None:
+            y_values = np.asarray(X[y.name] if y.name in X.columns else y, dtype=float)
+            total, count = self.target_total
+            self.target_total = (total + y_values.sum(), count + len(y_values))
+        
+        kinds = ('onehot', 'ordinal', 'frequency', 'target', 'binary')
+        columns = {col for kind in kinds for col in self.encoding_config.get(kind, []) if col in X.columns}
+        for col in columns:
+            self.category_counts[col] = merge_counts(self.category_counts.get(col), X[col])
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(X[col].isna().sum())
+        
+        for col in self.encoding_config.get('onehot', []):
+            if col in columns:
+                uniques, counts = self._counted_categories(col)
+                keep, has_other = self._select_onehot_categories(uniques, counts)
+                categories = uniques[keep] if has_other else uniques
+                self.encoders[f'{col}_onehot'] = {'categories': categories, 'other': has_other}
+        
+        for col in self.encoding_config.get('ordinal', []):
+            if col in columns:
+                uniques, _ = self._counted_categories(col)
+                encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+                self.encoders[f'{col}_ordinal'] = encoder.fit(pd.DataFrame({col: uniques}))
+        
+        for col in self.encoding_config.get('frequency', []):
+            if col in columns:
+                self.encoders[f'{col}_frequency'] = self.category_counts[col].astype(np.int64).to_dict()
+        
+        if y_values is not None:
+            smoothing = self.encoding_config.get('target_smoothing', 10)
+            total, count = self.target_total
+            prior = total / count
+            for col in self.encoding_config.get('target', []):
+                if col in columns and col != y.name:
+                    sums = pd.Series(y_values).groupby(X[col].to_numpy()).sum()
+                    self.target_sums[col] = sums if col not in self.target_sums else self.target_sums[col].add(sums, fill_value=0)
+                    sums = self.target_sums[col].sort_index()
+                    counts = self.category_counts[col].reindex(sums.index).to_numpy()
+                    mapping = (sums.to_numpy() + smoothing * prior) / (counts + smoothing)
+                    self.encoders[f'{col}_target'] = {'categories': sums.index, 'values': mapping, 'prior': prior}
+        
+        for col in self.encoding_config.get('binary', []):
+            if col in columns:
+                self.encoders[f'{col}_binary'] = self._counted_categories(col)[0]
+        
+        return self
+    
+    def _apply_target_map(self, values, target_map):
+        idx = pd.Index(target_map['categories']).get_indexer(values)
+        return np.where(idx >= 0, target_map['values'][np.maximum(idx, 0)], target_map['prior'])
     
     def fit_transform(self, X, y=None):
-        X_encoded = X.copy()
+        X_encoded = X.copy() if self.copy else X
         
         if 'onehot' in self.encoding_config:
-            for col in self.encoding_config['onehot']:
-                if col in X_encoded.columns:
-                    encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
-                    encoded_cols = encoder.fit_transform(X_encoded[[col]])
-                    feature_names = [f"{col}_{cat}" for cat in encoder.categories_[0]]
-                    encoded_df = pd.DataFrame(encoded_cols, columns=feature_names, index=X_encoded.index)
-                    X_encoded = X_encoded.drop(columns=[col])
-                    X_encoded = pd.concat([X_encoded, encoded_df], axis=1)
-                    self.encoders[f'{col}_onehot'] = encoder
+            with timed(self.timings, 'onehot'):
+                onehot_cols = [col for col in self.encoding_config['onehot'] if col in X_encoded.columns]
+                if onehot_cols:
+                    X_encoded = self._encode_onehot(X_encoded, onehot_cols)
         
         if 'ordinal' in self.encoding_config:
-            for col in self.encoding_config['ordinal']:
-                if col in X_encoded.columns:
-                    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
-                    X_encoded[col] = encoder.fit_transform(X_encoded[[col]]).ravel()
-                    self.encoders[f'{col}_ordinal'] = encoder
+            with timed(self.timings, 'ordinal'):
+                for col in self.encoding_config['ordinal']:
+                    if col in X_encoded.columns:
+                        encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+                        X_encoded[col] = encoder.fit_transform(X_encoded[[col]]).ravel()
+                        self.encoders[f'{col}_ordinal'] = encoder
         
         if 'frequency' in self.encoding_config:
-            for col in self.encoding_config['frequency']:
-                if col in X_encoded.columns:
-                    freq_map = X_encoded[col].value_counts().to_dict()
-                    X_encoded[col] = X_encoded[col].map(freq_map)
-                    self.encoders[f'{col}_frequency'] = freq_map
+            with timed(self.timings, 'frequency'):
+                for col in self.encoding_config['frequency']:
+                    if col in X_encoded.columns:
+                        freq_map = X_encoded[col].value_counts().to_dict()
+                        X_encoded[col] = np.asarray(X_encoded[col].map(freq_map))
+                        self.encoders[f'{col}_frequency'] = freq_map
         
         if 'target' in self.encoding_config and y is not None:
-            for col in self.encoding_config['target']:
-                if col in X_encoded.columns:
-                    target_map = X_encoded.groupby(col)[y.name].mean().to_dict()
-                    X_encoded[col] = X_encoded[col].map(target_map)
-                    self.encoders[f'{col}_target'] = target_map
+            with timed(self.timings, 'target'):
+                target_cols = [col for col in self.encoding_config['target']
+                               if col in X_encoded.columns and col != y.name]
+                if target_cols:
+                    X_encoded = self._encode_target(X_encoded, y, target_cols)
         
         if 'binary' in self.encoding_config:
-            for col in self.encoding_config['binary']:
-                if col in X_encoded.columns:
-                    unique_vals = X_encoded[col].unique()
-                    n_bits = int(np.ceil(np.log2(len(unique_vals))))
-                    for i in range(n_bits):
-                        X_encoded[f"{col}_bit_{i}"] = X_encoded[col].apply(
-                            lambda x: (hash(str(x)) >> i) & 1
-                        )
-                    X_encoded = X_encoded.drop(columns=[col])
-        
-        return X_encoded
+            with timed(self.timings, 'binary'):
+                binary_cols = [col for col in self.encoding_config['binary'] if col in X_encoded.columns]
+                if binary_cols:
+                    X_encoded = self._encode_binary(X_encoded, binary_cols)
+        
+        if 'hashing' in self.encoding_config:
+            with timed(self.timings, 'hashing'):
+                hashing_cols = [col for col in self.encoding_config['hashing'] if col in X_encoded.columns]
+                if hashing_cols:
+                    X_encoded = self._encode_hashing(X_encoded, hashing_cols)
+        
+        return cast_floats(X_encoded, self.dtype)
+    
+    def transform(self, X):
+        X_encoded = X.copy() if self.copy else X
+        
+        if 'onehot' in self.encoding_config:
+            onehot_cols = [col for col in self.encoding_config['onehot']
+                           if col in X_encoded.columns and f'{col}_onehot' in self.encoders]
+            if onehot_cols:
+                X_encoded = self._encode_onehot(X_encoded, onehot_cols, fit=False)
+        
+        for col in self.encoding_config.get('ordinal', []):
+            if f'{col}_ordinal' in self.encoders and col in X_encoded.columns:
+                X_encoded[col] = self.encoders[f'{col}_ordinal'].transform(X_encoded[[col]]).ravel()
+        
+        for col in self.encoding_config.get('frequency', []):
+            if f'{col}_frequency' in self.encoders and col in X_encoded.columns:
+                X_encoded[col] = np.asarray(X_encoded[col].map(self.encoders[f'{col}_frequency']))
+        
+        for col in self.encoding_config.get('target', []):
+            if f'{col}_target' in self.encoders and col in X_encoded.columns:
+                X_encoded[col] = self._apply_target_map(X_encoded[col], self.encoders[f'{col}_target'])
+        
+        binary_cols = [col for col in self.encoding_config.get('binary', [])
+                       if col in X_encoded.columns and f'{col}_binary' in self.encoders]
+        if binary_cols:
+            X_encoded = self._encode_binary(X_encoded, binary_cols, fit=False)
+        
+        hashing_cols = [col for col in self.encoding_config.get('hashing', []) if col in X_encoded.columns]
+        if hashing_cols:
+            X_encoded = self._encode_hashing(X_encoded, hashing_cols)
+        
+        return cast_floats(X_encoded, self.dtype)
 
 class RareCategoryHandler:
-    def __init__(self, columns=None, threshold=0.01, replacement='Other'):
+    def __init__(self, columns=None, threshold=0.01, replacement='Other', copy=True):
         self.columns = columns
         self.threshold = threshold
         self.replacement = replacement
+        self.copy = copy
         self.rare_maps = {}
+        self.category_maps = {}
+        self.category_counts = {}
+    
+    def _target_columns(self, X):
+        if self.columns is None:
+            return X.select_dtypes(include=['object', 'category']).columns
+        return [col for col in self.columns if col in X.columns]
+    
+    def _output_categories(self, kept):
+        if self.replacement in kept:
+            return kept, kept.get_loc(self.replacement)
+        return kept.append(pd.Index([self.replacement])), len(kept)
     
     def fit_transform(self, X):
-        X_processed = X.copy()
+        X_processed = X.copy() if self.copy else X
         
-        if self.columns is None:
-            categorical_cols = X.select_dtypes(include=['object', 'category']).columns
-        else:
-            categorical_cols = [col for col in self.columns if col in X.columns]
+        for col in self._target_columns(X):
+            codes, uniques = pd.factorize(X[col], sort=True)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            keep_mask = counts >= self.threshold * max(counts.sum(), 1)
+            
+            kept = uniques[keep_mask]
+            self.rare_maps[col] = uniques[~keep_mask]
+            self.category_maps[col] = kept
+            categories, replacement_code = self._output_categories(kept)
+            
+            code_map = np.full(len(uniques) + 1, -1)
+            code_map[:-1] = np.where(keep_mask, np.cumsum(keep_mask) - 1, replacement_code)
+            X_processed[col] = pd.Categorical.from_codes(code_map[codes], categories=categories)
+        
+        return X_processed
+    
+    def partial_fit(self, X):
+        for col in self._target_columns(X):
+            self.category_counts[col] = merge_counts(self.category_counts.get(col), X[col])
+            counts = self.category_counts[col].sort_index()
+            keep_mask = (counts >= self.threshold * max(counts.sum(), 1)).to_numpy()
+            self.category_maps[col] = counts.index[keep_mask]
+            self.rare_maps[col] = counts.index[~keep_mask]
+        return self
+    
+    def transform(self, X):
+        X_processed = X.copy() if self.copy else X
         
-        for col in categorical_cols:
-            value_counts = X[col].value_counts(normalize=True)
-            rare_categories = value_counts[value_counts < self.threshold].index.tolist()
-            self.rare_maps[col] = rare_categories
-            X_processed[col] = X_processed[col].replace(rare_categories, self.replacement)
+        for col, kept in self.category_maps.items():
+            if col not in X_processed.columns:
+                continue
+            categories, replacement_code = self._output_categories(kept)
+            codes = kept.get_indexer(X_processed[col])
+            codes = np.where(codes >= 0, codes, replacement_code)
+            codes[X_processed[col].isna().to_numpy()] = -1
+            X_processed[col] = pd.Categorical.from_codes(codes, categories=categories)
         
         return X_processed
 
 class FeatureScaler:
-    def __init__(self, scaling_config):
+    SCALERS = ('standard', 'minmax', 'robust', 'maxabs')
+    
+    def __init__(self, scaling_config, copy=True, dtype=None):
         self.scaling_config = scaling_config
+        self.copy = copy
+        self.dtype = dtype
         self.scalers = {}
+        self.timings = {}
+        self.sketches = {}
     
     def fit_transform(self, X):
-        X_scaled = X.copy()
+        X_scaled = X.copy() if self.copy else X
         
         if 'standard' in self.scaling_config:
-            for col in self.scaling_config['standard']:
-                if col in X_scaled.columns:
-                    scaler = StandardScaler()
-                    X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
-                    self.scalers[f'{col}_standard'] = scaler
+            with timed(self.timings, 'standard'):
+                for col in self.scaling_config['standard']:
+                    if col in X_scaled.columns:
+                        scaler = StandardScaler()
+                        X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
+                        self.scalers[f'{col}_standard'] = scaler
         
         if 'minmax' in self.scaling_config:
-            for col in self.scaling_config['minmax']:
-                if col in X_scaled.columns:
-                    scaler = MinMaxScaler()
-                    X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
-                    self.scalers[f'{col}_minmax'] = scaler
+            with timed(self.timings, 'minmax'):
+                for col in self.scaling_config['minmax']:
+                    if col in X_scaled.columns:
+                        scaler = MinMaxScaler()
+                        X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
+                        self.scalers[f'{col}_minmax'] = scaler
         
         if 'robust' in self.scaling_config:
-            for col in self.scaling_config['robust']:
-                if col in X_scaled.columns:
-                    scaler = RobustScaler()
-                    X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
-                    self.scalers[f'{col}_robust'] = scaler
+            with timed(self.timings, 'robust'):
+                for col in self.scaling_config['robust']:
+                    if col in X_scaled.columns:
+                        scaler = RobustScaler()
+                        X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
+                        self.scalers[f'{col}_robust'] = scaler
         
         if 'maxabs' in self.scaling_config:
-            for col in self.scaling_config['maxabs']:
-                if col in X_scaled.columns:
-                    scaler = MaxAbsScaler()
-                    X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
-                    self.scalers[f'{col}_maxabs'] = scaler
+            with timed(self.timings, 'maxabs'):
+                for col in self.scaling_config['maxabs']:
+                    if col in X_scaled.columns:
+                        scaler = MaxAbsScaler()
+                        X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
+                        self.scalers[f'{col}_maxabs'] = scaler
         
         if 'quantile' in self.scaling_config:
-            for col in self.scaling_config['quantile']:
-                if col in X_scaled.columns:
-                    scaler = QuantileTransformer(output_distribution='normal')
-                    X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
-                    self.scalers[f'{col}_quantile'] = scaler
+            with timed(self.timings, 'quantile'):
+                for col in self.scaling_config['quantile']:
+                    if col in X_scaled.columns:
+                        scaler = QuantileTransformer(output_distribution='normal')
+                        X_scaled[col] = scaler.fit_transform(X_scaled[[col]]).ravel()
+                        self.scalers[f'{col}_quantile'] = scaler
+        
+        return cast_floats(X_scaled, self.dtype)
+    
+    def partial_fit(self, X):
+        if self.scaling_config.get('quantile'):
+            raise ValueError("Quantile scaling needs the full dataset and cannot be fitted in chunks")
+        scaled_cols = [col for key in self.SCALERS for col in self.scaling_config.get(key, [])]
+        if len(scaled_cols) != len(set(scaled_cols)):
+            raise ValueError("Columns scaled by more than one scaler cannot be fitted in chunks")
+        
+        for key, scaler_cls in (('standard', StandardScaler), ('minmax', MinMaxScaler), ('maxabs', MaxAbsScaler)):
+            for col in self.scaling_config.get(key, []):
+                if col in X.columns:
+                    if f'{col}_{key}' not in self.scalers:
+                        self.scalers[f'{col}_{key}'] = scaler_cls()
+                    self.scalers[f'{col}_{key}'].partial_fit(X[[col]])
+        
+        for col in self.scaling_config.get('robust', []):
+            if col in X.columns:
+                if col not in self.sketches:
+                    self.sketches[col] = QuantileSketch()
+                q25, median, q75 = self.sketches[col].update(X[col].to_numpy(dtype=float)).quantile([0.25, 0.5, 0.75])
+                # RobustScaler has no partial_fit, so the sketch quantiles become its fitted state.
+                scaler = RobustScaler()
+                scaler.center_ = np.array([median])
+                scaler.scale_ = np.array([q75 - q25 if q75 > q25 else 1.0])
+                scaler.n_features_in_ = 1
+                scaler.feature_names_in_ = np.array([col], dtype=object)
+                self.scalers[f'{col}_robust'] = scaler
         
-        return X_scaled
+        return self
+    
+    def transform(self, X):
+        X_scaled = X.copy() if self.copy else X
+        
+        for key in self.SCALERS + ('quantile',):
+            for col in self.scaling_config.get(key, []):
+                if col in X_scaled.columns and f'{col}_{key}' in self.scalers:
+                    X_scaled[col] = self.scalers[f'{col}_{key}'].transform(X_scaled[[col]]).ravel()
+        
+        return cast_floats(X_scaled, self.dtype)
+
+def fit_power_lambda(method, values):
+    values = values[~np.isnan(values)]
+    if method == 'boxcox':
+        return stats.boxcox_normmax(values, method='mle')
+    return stats.yeojohnson_normmax(values)
+
+def yeojohnson_transform(values, lambdas):
+    positive = values >= 0
+    return np.where(positive,
+                    special.boxcox1p(np.where(positive, values, 0), lambdas),
+                    -special.boxcox1p(np.where(positive, 0, -values), 2 - lambdas))
 
 class SkewnessHandler:
-    def __init__(self, method='log', columns=None, threshold=0.5):
+    def __init__(self, method='log', columns=None, threshold=0.5, n_jobs=1, sample_size=None, copy=True, dtype=None):
         self.method = method
         self.columns = columns
         self.threshold = threshold
+        self.n_jobs = n_jobs
+        self.sample_size = sample_size
+        self.copy = copy
+        self.dtype = dtype
         self.transform_params = {}
+        self.timings = {}
+        self.moments = None
+        self.min_values = None
+        self.has_nan = None
+        self._fit_columns = None
+        self._reservoir = None
+        self._n_seen = 0
+        self._rng = np.random.default_rng(42)
     
-    def fit_transform(self, X):
-        X_transformed = X.copy()
-        
+    def _numeric_columns(self, X):
         if self.columns is None:
-            numeric_cols = X.select_dtypes(include=[np.number]).columns
-        else:
-            numeric_cols = [col for col in self.columns if col in X.columns]
+            return X.select_dtypes(include=[np.number]).columns
+        return [col for col in self.columns if col in X.columns]
+    
+    def _fit_params(self, numeric_cols, skewness, min_values, has_nan, sample):
+        skewed = np.abs(skewness) > self.threshold
         
-        for col in numeric_cols:
-            skewness = stats.skew(X[col].dropna())
-            
-            if abs(skewness) > self.threshold:
-                if self.method == 'log':
-                    if (X[col] > 0).all():
-                        X_transformed[col] = np.log(X[col])
-                    else:
-                        X_transformed[col] = np.log1p(X[col] - X[col].min() + 1)
-                
-                elif self.method == 'boxcox':
-                    if (X[col] > 0).all():
-                        transformed, lambda_param = boxcox(X[col])
-                        X_transformed[col] = transformed
-                        self.transform_params[col] = {'method': 'boxcox', 'lambda': lambda_param}
-                
-                elif self.method == 'yeo_johnson':
-                    transformed, lambda_param = yeojohnson(X[col])
-                    X_transformed[col] = transformed
-                    self.transform_params[col] = {'method': 'yeo_johnson', 'lambda': lambda_param}
-                
-                elif self.method == 'sqrt':
-                    if (X[col] >= 0).all():
-                        X_transformed[col] = np.sqrt(X[col])
-                
-                elif self.method == 'reciprocal':
-                    X_transformed[col] = 1 / (X[col] + 1)
+        lambda_cols = []
+        for j, col in enumerate(numeric_cols):
+            if not skewed[j]:
+                continue
+            positive = min_values[j] > 0 and not has_nan[j]
+            if self.method == 'log':
+                if positive:
+                    self.transform_params[col] = {'method': 'log', 'shift': None}
+                else:
+                    self.transform_params[col] = {'method': 'log', 'shift': 1 - min_values[j]}
+            elif self.method == 'boxcox':
+                if positive:
+                    lambda_cols.append(j)
+            elif self.method == 'yeo_johnson':
+                lambda_cols.append(j)
+            elif self.method == 'sqrt':
+                if min_values[j] >= 0 and not has_nan[j]:
+                    self.transform_params[col] = {'method': 'sqrt'}
+            elif self.method == 'reciprocal':
+                self.transform_params[col] = {'method': 'reciprocal'}
+        
+        if lambda_cols:
+            sample = sample[:, lambda_cols]
+            if self.sample_size and len(sample) > self.sample_size:
+                rows = np.random.default_rng(42).choice(len(sample), self.sample_size, replace=False)
+                sample = sample[rows]
+            lambdas = parallel_map(
+                fit_power_lambda,
+                [(self.method, sample[:, i]) for i in range(len(lambda_cols))],
+                n_jobs=self.n_jobs,
+                use_processes=True
+            )
+            for j, lambda_param in zip(lambda_cols, lambdas):
+                self.transform_params[numeric_cols[j]] = {'method': self.method, 'lambda': lambda_param}
+    
+    def fit(self, X):
+        numeric_cols = self._numeric_columns(X)
+        if len(numeric_cols) == 0:
+            return self
+        
+        values = X[numeric_cols].to_numpy(dtype=float)
+        skewness = stats.skew(values, axis=0, nan_policy='omit')
+        self._fit_params(numeric_cols, skewness, np.fmin.reduce(values, axis=0), np.isnan(values).any(axis=0), values)
+        return self
+    
+    def _update_reservoir(self, values):
+        # Algorithm R over rows, so the power-transform lambdas are fitted on a
+        # uniform sample of bounded size however long the stream is.
+        size = self.sample_size or 10000
+        if self._reservoir is None:
+            self._reservoir = np.empty((0, values.shape[1]))
+        n_fill = min(size - len(self._reservoir), len(values))
+        if n_fill:
+            self._reservoir = np.vstack([self._reservoir, values[:n_fill]])
+        rest = values[n_fill:]
+        slots = self._rng.integers(0, self._n_seen + n_fill + np.arange(1, len(rest) + 1))
+        hit = slots < size
+        self._reservoir[slots[hit]] = rest[hit]
+        self._n_seen += len(values)
+    
+    def partial_fit(self, X):
+        if self._fit_columns is None:
+            self._fit_columns = list(self._numeric_columns(X))
+        if not self._fit_columns:
+            return self
+        
+        values = X[self._fit_columns].to_numpy(dtype=float)
+        self.moments = update_moments(self.moments, values)
+        chunk_min = np.fmin.reduce(values, axis=0)
+        self.min_values = chunk_min if self.min_values is None else np.fmin(self.min_values, chunk_min)
+        chunk_nan = np.isnan(values).any(axis=0)
+        self.has_nan = chunk_nan if self.has_nan is None else self.has_nan | chunk_nan
+        if self.method in ('boxcox', 'yeo_johnson'):
+            self._update_reservoir(values)
+        return self
+    
+    def finalize(self):
+        # Resolves transform_params from the statistics gathered by partial_fit;
+        # the lambda search is too costly to repeat for every chunk.
+        self.transform_params = {}
+        if self.moments is None:
+            return self
+        n = np.maximum(self.moments['n'], 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skewness = (self.moments['m3'] / n) / (self.moments['m2'] / n) ** 1.5
+        self._fit_params(self._fit_columns, np.nan_to_num(skewness), self.min_values, self.has_nan, self._reservoir)
+        return self
+    
+    def transform(self, X):
+        X_transformed = X.copy() if self.copy else X
+        groups = {}
+        for col, params in self.transform_params.items():
+            if col in X_transformed.columns:
+                groups.setdefault(params['method'], []).append(col)
+        
+        for method, cols in groups.items():
+            # Lambdas and shifts are fitted in float64; only the applied block uses dtype.
+            values = X_transformed[cols].to_numpy(dtype=float_dtype(self.dtype))
+            if method == 'log':
+                shifts = np.array([self.transform_params[col]['shift'] for col in cols], dtype=float)
+                has_shift = ~np.isnan(shifts)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = np.where(has_shift, np.log1p(values + np.where(has_shift, shifts, 0)), np.log(values))
+            elif method in ('boxcox', 'yeo_johnson'):
+                lambdas = np.array([self.transform_params[col]['lambda'] for col in cols])
+                if method == 'boxcox':
+                    result = special.boxcox(values, lambdas)
+                else:
+                    result = yeojohnson_transform(values, lambdas)
+            elif method == 'sqrt':
+                result = np.sqrt(values)
+            else:
+                result = 1 / (values + 1)
+            X_transformed[cols] = result.astype(values.dtype, copy=False)
         
         return X_transformed
+    
+    def fit_transform(self, X):
+        with timed(self.timings, 'fit'):
+            self.fit(X)
+        with timed(self.timings, 'transform'):
+            return self.transform(X)
 
 class ClassImbalanceHandler:
-    def __init__(self, method='smote', k_neighbors=5, sampling_strategy='auto'):
+    def __init__(self, method='smote', k_neighbors=5, sampling_strategy='auto', n_jobs=1, chunk_size=None, dtype=None):
         self.method = method
         self.k_neighbors = k_neighbors
         self.sampling_strategy = sampling_strategy
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.dtype = dtype
         self.sampler = None
     
+    def _neighbors(self):
+        return NearestNeighbors(n_neighbors=self.k_neighbors + 1, n_jobs=self.n_jobs)
+    
+    def _sampling_targets(self, y):
+        # Rows to generate per class, with imblearn's own reading of sampling_strategy
+        # (float, 'minority', 'not majority', 'auto', dict, callable), so the chunked
+        # path resamples to the same class counts as SMOTE.
+        targets = check_sampling_strategy(self.sampling_strategy, y, 'over-sampling')
+        return {cls: int(n) for cls, n in targets.items() if n > 0}
+    
+    def generate_synthetic(self, X, y, out=None):
+        # SMOTE interpolation written chunk by chunk into a preallocated array, so
+        # only the synthetic rows are ever materialised.
+        values = np.asarray(X, dtype=float_dtype(self.dtype))
+        y_values = np.asarray(y)
+        targets = self._sampling_targets(y_values)
+        n_synthetic = sum(targets.values())
+        if out is None:
+            out = np.empty((n_synthetic, values.shape[1]), dtype=values.dtype)
+        y_out = np.empty(n_synthetic, dtype=y_values.dtype)
+        chunk_size = self.chunk_size or 10000
+        rng = np.random.default_rng(42)
+        
+        pos = 0
+        for cls, n_samples in targets.items():
+            class_values = values[y_values == cls]
+            k = min(self.k_neighbors, len(class_values) - 1)
+            if k < 1:
+                continue
+            nn = NearestNeighbors(n_neighbors=k, n_jobs=self.n_jobs).fit(class_values)
+            neighbor_idx = nn.kneighbors(return_distance=False)
+            
+            for start in range(0, n_samples, chunk_size):
+                size = min(chunk_size, n_samples - start)
+                base = rng.integers(len(class_values), size=size)
+                chosen = neighbor_idx[base, rng.integers(k, size=size)]
+                gap = rng.random((size, 1))
+                chunk = out[pos:pos + size]
+                np.subtract(class_values[chosen], class_values[base], out=chunk)
+                chunk *= gap
+                chunk += class_values[base]
+                y_out[pos:pos + size] = cls
+                pos += size
+        
+        return out[:pos], y_out[:pos]
+    
     def fit_resample(self, X, y):
+        if self.method == 'smote' and self.chunk_size and isinstance(X, pd.DataFrame):
+            # Only the synthetic block goes through the float buffer; the original rows
+            # keep their dtypes and values (no int -> float32 -> int round trip).
+            synthetic, y_synthetic = self.generate_synthetic(X, y)
+            synthetic = pd.DataFrame(synthetic, columns=X.columns, copy=False).astype(X.dtypes.to_dict())
+            X_resampled = pd.concat([X, synthetic], ignore_index=True)
+            y_resampled = pd.Series(np.concatenate([np.asarray(y), y_synthetic]), name=getattr(y, 'name', None))
+            return X_resampled, y_resampled
+        
+        if self.method == 'smote' and self.chunk_size:
+            values = np.asarray(X, dtype=float_dtype(self.dtype))
+            n_synthetic = sum(self._sampling_targets(np.asarray(y)).values())
+            X_resampled = np.empty((len(values) + n_synthetic, values.shape[1]), dtype=values.dtype)
+            X_resampled[:len(values)] = values
+            _, y_synthetic = self.generate_synthetic(values, y, out=X_resampled[len(values):])
+            X_resampled = X_resampled[:len(values) + len(y_synthetic)]
+            y_resampled = np.concatenate([np.asarray(y), y_synthetic])
+            return X_resampled, y_resampled
+        
         if self.method == 'smote':
-            self.sampler = SMOTE(k_neighbors=self.k_neighbors, random_state=42)
+            self.sampler = SMOTE(sampling_strategy=self.sampling_strategy, k_neighbors=self._neighbors(), random_state=42)
         elif self.method == 'adasyn':
-            self.sampler = ADASYN(n_neighbors=self.k_neighbors, random_state=42)
+            self.sampler = ADASYN(sampling_strategy=self.sampling_strategy, n_neighbors=self._neighbors(), random_state=42)
         elif self.method == 'borderline_smote':
-            self.sampler = BorderlineSMOTE(k_neighbors=self.k_neighbors, random_state=42)
+            self.sampler = BorderlineSMOTE(sampling_strategy=self.sampling_strategy, k_neighbors=self._neighbors(), random_state=42)
         elif self.method == 'random_oversample':
             from imblearn.over_sampling import RandomOverSampler
-            self.sampler = RandomOverSampler(random_state=42)
+            self.sampler = RandomOverSampler(sampling_strategy=self.sampling_strategy, random_state=42)
         elif self.method == 'random_undersample':
-            self.sampler = RandomUnderSampler(random_state=42)
+            self.sampler = RandomUnderSampler(sampling_strategy=self.sampling_strategy, random_state=42)
         elif self.method == 'smote_tomek':
-            self.sampler = SMOTETomek(random_state=42)
+            self.sampler = SMOTETomek(sampling_strategy=self.sampling_strategy, random_state=42,
+                                      smote=SMOTE(sampling_strategy=self.sampling_strategy, k_neighbors=self._neighbors(), random_state=42))
         elif self.method == 'smote_enn':
-            self.sampler = SMOTEENN(random_state=42)
+            self.sampler = SMOTEENN(sampling_strategy=self.sampling_strategy, random_state=42,
+                                    smote=SMOTE(sampling_strategy=self.sampling_strategy, k_neighbors=self._neighbors(), random_state=42))
         
         if self.sampler:
             X_resampled, y_resampled = self.sampler.fit_resample(X, y)
@@ -364,16 +1276,521 @@ class ClassImbalanceHandler:
         
         return X, y
 
+class PreprocessingPlan:
+    # Compiles the elementwise part of a preprocessing config (simple imputation,
+    # percentile capping, skew transforms and affine scaling) into one chain per
+    # numeric column, groups columns that share a chain and runs each group as a
+    # single row-chunked pass over a float block. Everything else is left in
+    # residual_config for the staged handlers.
+    FILL_STRATEGIES = ('constant', 'mean', 'median', 'mode')
+    UNFUSABLE_IMPUTATION = ('knn', 'iterative', 'forward_fill', 'backward_fill', 'interpolate')
+    SCALERS = ('standard', 'minmax', 'robust', 'maxabs')
+    OUTLIER_METHODS = ('zscore', 'modified_zscore', 'iqr', 'isolation_forest', 'lof')
+    NUMEXPR_SKEW_METHODS = ('log', 'sqrt', 'reciprocal', 'boxcox')
+    
+    def __init__(self, config, target_column=None, chunk_size=65536, use_numexpr=True, dtype=None):
+        self.config = config
+        self.target_column = target_column
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.groups = {}
+        self.params = {}
+        self.residual_config = config
+        self._numexpr = None
+        if use_numexpr:
+            try:
+                import numexpr
+                self._numexpr = numexpr
+            except ImportError:
+                self._numexpr = None
+    
+    def __getstate__(self):
+        # The numexpr module itself cannot be pickled; remember only whether it was in use.
+        state = self.__dict__.copy()
+        state['_numexpr'] = self._numexpr is not None
+        return state
+    
+    def __setstate__(self, state):
+        use_numexpr = state.pop('_numexpr')
+        self.__dict__.update(state)
+        self._numexpr = None
+        if use_numexpr:
+            try:
+                import numexpr
+                self._numexpr = numexpr
+            except ImportError:
+                self._numexpr = None
+    
+    def _column_chain(self, col, df):
+        imputation = self.config.get('imputation', {})
+        outlier = self.config.get('outlier')
+        skewness = self.config.get('skewness')
+        scaling = self.config.get('scaling', {})
+        encoding = self.config.get('encoding', {})
+        rare = self.config.get('rare_category')
+        
+        if col == self.target_column:
+            return None
+        if any(col in imputation.get(key, []) for key in self.UNFUSABLE_IMPUTATION):
+            return None
+        if any(col in cols for key, cols in encoding.items() if isinstance(cols, list)):
+            return None
+        if rare is not None and col in (rare.get('columns') or []):
+            return None
+        if col in scaling.get('quantile', []):
+            return None
+        
+        chain = []
+        fill = next((key for key in self.FILL_STRATEGIES if col in imputation.get(key, [])), None)
+        if fill:
+            chain.append(('fill', fill))
+        if outlier is not None and (outlier.get('columns') is None or col in outlier['columns']):
+            if outlier.get('action', 'cap') == 'cap' and outlier.get('method', 'zscore') in self.OUTLIER_METHODS:
+                chain.append(('clip', None))
+            elif outlier.get('action') == 'transform_log':
+                chain.append(('log1p', None))
+        if skewness is not None and (skewness.get('columns') is None or col in skewness['columns']):
+            chain.append(('skew', skewness.get('method', 'log')))
+        scalers = tuple(key for key in self.SCALERS if col in scaling.get(key, []))
+        if scalers:
+            chain.append(('scale', scalers))
+        return tuple(chain) or None
+    
+    def compile(self, df):
+        self.groups = {}
+        outlier = self.config.get('outlier') or {}
+        if outlier.get('action') == 'remove' or outlier.get('approximate', False):
+            return self
+        
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        imputation = self.config.get('imputation', {})
+        if 'drop_high_missing' in imputation:
+            threshold = imputation['drop_high_missing'].get('threshold', 0.5)
+            missing_ratio = df[numeric_cols].isnull().mean()
+            numeric_cols = missing_ratio[missing_ratio <= threshold].index
+        
+        for col in numeric_cols:
+            chain = self._column_chain(col, df)
+            if chain:
+                self.groups.setdefault(chain, []).append(col)
+        self.residual_config = self._residual_config(df)
+        return self
+    
+    def _residual_config(self, df):
+        fused = {col for cols in self.groups.values() for col in cols}
+        if not fused:
+            return self.config
+        residual = copy.deepcopy(self.config)
+        
+        for key in self.FILL_STRATEGIES:
+            if key in residual.get('imputation', {}):
+                residual['imputation'][key] = [col for col in residual['imputation'][key] if col not in fused]
+        for key in self.SCALERS:
+            if key in residual.get('scaling', {}):
+                residual['scaling'][key] = [col for col in residual['scaling'][key] if col not in fused]
+        
+        rare_cols = set((residual.get('rare_category') or {}).get('columns') or [])
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        for key in ('outlier', 'skewness'):
+            if key in residual:
+                columns = residual[key].get('columns')
+                if columns is None:
+                    columns = [col for col in numeric_cols if key == 'outlier' or col not in rare_cols]
+                residual[key]['columns'] = [col for col in columns if col not in fused]
+        return residual
+    
+    def _fit_step(self, step, block, cols):
+        kind, option = step
+        if kind == 'fill':
+            if option == 'constant':
+                values = np.full(block.shape[1], self.config['imputation'].get('fill_value', 0), dtype=float)
+            elif option == 'mean':
+                values = np.nanmean(block, axis=0)
+            elif option == 'median':
+                values = np.nanmedian(block, axis=0)
+            else:
+                values = pd.DataFrame(block).mode().iloc[0].to_numpy(dtype=float)
+            return {'value': values}
+        if kind == 'clip':
+            outlier = self.config['outlier']
+            lower, upper = np.percentile(block, [outlier.get('percentile_low', 0.05) * 100,
+                                                 outlier.get('percentile_high', 0.95) * 100], axis=0)
+            return {'lower': lower, 'upper': upper}
+        if kind == 'log1p':
+            return {}
+        if kind == 'skew':
+            skewness = self.config['skewness']
+            handler = SkewnessHandler(method=option, threshold=skewness.get('threshold', 0.5),
+                                      n_jobs=skewness.get('n_jobs', 1), sample_size=skewness.get('sample_size'))
+            handler.fit(pd.DataFrame(block, columns=cols))
+            active = np.array([col in handler.transform_params for col in cols])
+            param = np.ones(len(cols))
+            for j, col in enumerate(cols):
+                fitted = handler.transform_params.get(col, {})
+                if 'lambda' in fitted:
+                    param[j] = fitted['lambda']
+                elif fitted.get('method') == 'log':
+                    param[j] = 0.0 if fitted['shift'] is None else 1 + fitted['shift']
+            return {'active': active, 'param': param}
+        
+        center, scale = np.zeros(block.shape[1]), np.ones(block.shape[1])
+        for scaler in option:
+            work = (block - center) / scale
+            if scaler == 'standard':
+                step_center, step_scale = np.nanmean(work, axis=0), np.nanstd(work, axis=0)
+            elif scaler == 'minmax':
+                step_center = np.nanmin(work, axis=0)
+                step_scale = np.nanmax(work, axis=0) - step_center
+            elif scaler == 'robust':
+                step_center = np.nanmedian(work, axis=0)
+                q25, q75 = np.nanpercentile(work, [25, 75], axis=0)
+                step_scale = q75 - q25
+            else:
+                step_center = np.zeros(block.shape[1])
+                step_scale = np.nanmax(np.abs(work), axis=0)
+            step_scale = np.where(step_scale < 10 * np.finfo(float).eps, 1.0, step_scale)
+            # Consecutive affine maps compose into one: ((x - c1) / s1 - c2) / s2.
+            center = center + step_center * scale
+            scale = scale * step_scale
+        return {'center': center, 'scale': scale}
+    
+    def _apply_step(self, step, params, block):
+        kind, option = step
+        if kind == 'fill':
+            np.copyto(block, params['value'], where=np.isnan(block))
+        elif kind == 'clip':
+            np.clip(block, params['lower'], params['upper'], out=block)
+        elif kind == 'log1p':
+            np.log1p(block, out=block)
+        elif kind == 'skew':
+            active = params['active']
+            if not active.any():
+                return block
+            values, param = block[:, active], params['param'][active]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if option == 'log':
+                    values = np.log(values + param)
+                elif option == 'boxcox':
+                    values = special.boxcox(values, param)
+                elif option == 'yeo_johnson':
+                    values = yeojohnson_transform(values, param)
+                elif option == 'sqrt':
+                    values = np.sqrt(values)
+                else:
+                    values = 1 / (values + 1)
+            block[:, active] = values
+        else:
+            block -= params['center']
+            block /= params['scale']
+        return block
+    
+    def _numexpr_kernel(self, chain, params):
+        # The whole chain as one numexpr expression; only fill feeds into the
+        # where() branches that repeat their operand, so the text stays small.
+        if self._numexpr is None:
+            return None
+        expr, local_dict = 'x', {}
+        for i, (step, step_params) in enumerate(zip(chain, params)):
+            kind, option = step
+            names = {key: f'{key}_{i}' for key in step_params}
+            for key, name in names.items():
+                local_dict[name] = np.asarray(step_params[key])[None, :]
+            if kind == 'fill':
+                expr = f"where({expr} != {expr}, {names['value']}, {expr})"
+            elif kind == 'clip':
+                expr = f"where({expr} < {names['lower']}, {names['lower']}, where({expr} > {names['upper']}, {names['upper']}, {expr}))"
+            elif kind == 'log1p':
+                expr = f"log1p({expr})"
+            elif kind == 'skew':
+                if option not in self.NUMEXPR_SKEW_METHODS:
+                    return None
+                active, param = names['active'], names['param']
+                if option == 'log':
+                    value = f"log({expr} + {param})"
+                elif option == 'boxcox':
+                    value = f"where({param} == 0, log({expr}), ({expr} ** {param} - 1) / {param})"
+                elif option == 'sqrt':
+                    value = f"sqrt({expr})"
+                else:
+                    value = f"1 / ({expr} + 1)"
+                expr = f"where({active}, {value}, {expr})"
+            else:
+                expr = f"({expr} - {names['center']}) / {names['scale']}"
+        return expr, local_dict
+    
+    def _run_chain(self, chain, params, values):
+        kernel = self._numexpr_kernel(chain, params)
+        for start in range(0, len(values), self.chunk_size):
+            block = values[start:start + self.chunk_size]
+            if kernel is not None:
+                expr, local_dict = kernel
+                block[:] = self._numexpr.evaluate(expr, local_dict={**local_dict, 'x': block})
+            else:
+                for step, step_params in zip(chain, params):
+                    self._apply_step(step, step_params, block)
+        return values
+    
+    def fit_transform(self, df):
+        self.compile(df)
+        self.params = {}
+        for chain, cols in self.groups.items():
+            block = df[cols].to_numpy(dtype=float, copy=True)
+            fitted = []
+            for step in chain:
+                step_params = self._fit_step(step, block, cols)
+                self._apply_step(step, step_params, block)
+                fitted.append(step_params)
+            self.params[chain] = fitted
+            # Parameters are fitted on a float64 block; the result is stored as dtype.
+            df[cols] = block.astype(float_dtype(self.dtype), copy=False)
+        return df
+    
+    def transform(self, df):
+        for chain, cols in self.groups.items():
+            block = df[cols].to_numpy(dtype=float_dtype(self.dtype), copy=True)
+            df[cols] = self._run_chain(chain, self.params[chain], block)
+        return df
+
+class DiskCache:
+    # Directory of one-file entries, shared by the preprocessing and feature caches.
+    # Reads touch the file, so evicting by oldest mtime once the directory is over
+    # max_bytes is least-recently-used. Subclasses build the keys and pick the
+    # payload format through SUFFIX, READ_ERRORS, _read and _write.
+    SUFFIX = '.pkl'
+    READ_ERRORS = (OSError, pickle.UnpicklingError, EOFError)
+    
+    def __init__(self, cache_dir, max_bytes=1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def library_versions(source):
+        # source is the module whose code builds the entries; editing it invalidates them.
+        return {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            Path(source).stem: hashlib.sha256(Path(source).read_bytes()).hexdigest()[:16]
+        }
+    
+    def _path(self, key):
+        return self.cache_dir / f'{key}{self.SUFFIX}'
+    
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    
+    def _write(self, f, entry):
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def get(self, key):
+        path = self._path(key)
+        try:
+            entry = self._read(path)
+        except self.READ_ERRORS:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return entry
+    
+    def put(self, key, entry, evict=True):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            self._write(f, entry)
+        os.replace(tmp_path, path)
+        if evict:
+            self.evict()
+    
+    def evict(self):
+        entries = sorted(self.cache_dir.glob(f'*{self.SUFFIX}'), key=lambda path: path.stat().st_mtime)
+        total = sum(path.stat().st_size for path in entries)
+        for path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+class PreprocessingCache(DiskCache):
+    # Fitted preprocessing state keyed by (dataset fingerprint, normalised config
+    # hash, library versions). Each entry is one pickle holding the fitted handlers
+    # and, with store_output=True, the processed frame.
+    HANDLERS = ('plan', 'missing_handler', 'outlier_handler', 'rare_handler', 'skewness_handler',
+                'encoder', 'scaler', 'imbalance_handler')
+    
+    def __init__(self, cache_dir='.preprocess_cache', max_bytes=1024 ** 3, store_output=True):
+        super().__init__(cache_dir, max_bytes)
+        self.store_output = store_output
+    
+    @staticmethod
+    def dataset_fingerprint(df):
+        digest = hashlib.sha256()
+        digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def config_hash(config, **options):
+        # Key order is irrelevant to the handlers, list order is not (it fixes the output column order).
+        normalised = json.dumps({'config': config, 'options': options}, sort_keys=True, default=str)
+        return hashlib.sha256(normalised.encode()).hexdigest()
+    
+    @staticmethod
+    def library_versions():
+        import sklearn
+        import scipy
+        import imblearn
+        return {
+            **DiskCache.library_versions(__file__),
+            'scikit-learn': sklearn.__version__,
+            'scipy': scipy.__version__,
+            'imbalanced-learn': imblearn.__version__,
+        }
+    
+    def key(self, df, config, **options):
+        parts = [self.dataset_fingerprint(df), self.config_hash(config, **options),
+                 json.dumps(self.library_versions(), sort_keys=True)]
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+class StageProfiler:
+    # Per-stage breakdown for preprocessing_report. Wall time and frame shapes
+    # are always recorded, along with the handler's own per-strategy timings;
+    # memory=True adds the tracemalloc peak and the columns (and bytes) the stage
+    # returned in newly allocated memory, and profiler='cprofile' or 'pyinstrument'
+    # keeps a text capture of every stage.
+    def __init__(self, memory=False, profiler=None, top=20):
+        if profiler not in (None, 'cprofile', 'pyinstrument'):
+            raise ValueError(f"Unknown profiler '{profiler}', expected 'cprofile' or 'pyinstrument'")
+        self.memory = memory
+        self.profiler = profiler
+        self.top = top
+        self.stages = []
+    
+    @staticmethod
+    def _column_buffers(series):
+        # Address -> size of the memory backing a column, read without copying it.
+        # Extension arrays with no public buffer (masked, datetime) are not tracked.
+        values = series.array
+        if isinstance(values, pd.Categorical):
+            values = values.codes
+        elif hasattr(values, '__arrow_array__'):
+            return {buffer.address: buffer.size for chunk in values.__arrow_array__().chunks
+                    for buffer in chunk.buffers() if buffer is not None}
+        elif isinstance(values, pd.arrays.NumpyExtensionArray):
+            values = np.asarray(values)
+        if not isinstance(values, np.ndarray):
+            return {}
+        return {values.__array_interface__['data'][0]: values.nbytes}
+    
+    def _frame_buffers(self, df):
+        return [self._column_buffers(df.iloc[:, i]) for i in range(df.shape[1])]
+    
+    def _count_copies(self, record, before, result):
+        # Compared at the handler boundary: output columns whose memory the input did
+        # not have were copied or computed by the stage, by whatever pandas call. Copies
+        # freed inside the stage do not show here; they are in the peak allocation.
+        seen = set().union(*before)
+        copied = [buffers for buffers in self._frame_buffers(result) if buffers and not seen.issuperset(buffers)]
+        record['copied_columns'] = len(copied)
+        record['copied_bytes'] = sum(size for buffers in copied for address, size in buffers.items() if address not in seen)
+    
+    def _start_profile(self):
+        if self.profiler == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("pyinstrument is required for profiler='pyinstrument'. Please install it using: pip install pyinstrument")
+            profile = Profiler()
+            profile.start()
+            return profile
+        return None
+    
+    def _stop_profile(self, profile):
+        if self.profiler == 'cprofile':
+            profile.disable()
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+            return stream.getvalue()
+        profile.stop()
+        return profile.output_text()
+    
+    def run(self, name, func, df, *args, handler=None):
+        record = {'stage': name, 'rows_in': df.shape[0], 'cols_in': df.shape[1]}
+        tracing = False
+        if self.memory:
+            before = self._frame_buffers(df)
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        
+        profile = self._start_profile()
+        start = time.perf_counter()
+        try:
+            result = func(df, *args)
+        finally:
+            record['wall_time'] = time.perf_counter() - start
+            if profile is not None:
+                record['profile'] = self._stop_profile(profile)
+            if self.memory:
+                record['bytes_allocated'] = tracemalloc.get_traced_memory()[1] - baseline
+                if not tracing:
+                    tracemalloc.stop()
+        
+        record['rows_out'], record['cols_out'] = result.shape
+        if self.memory:
+            self._count_copies(record, before, result)
+        if handler is not None and handler.timings:
+            record['strategies'] = dict(handler.timings)
+        self.stages.append(record)
+        return result
+    
+    def table(self):
+        headers = ["Stage", "Time (s)", "Rows in → out", "Cols in → out"]
+        if self.memory:
+            headers += ["Peak alloc (MB)", "Cols copied", "Copied (MB)"]
+        table = [headers]
+        for record in self.stages:
+            row = [record['stage'], f"{record['wall_time']:.3f}",
+                   f"{record['rows_in']:,} → {record['rows_out']:,}", f"{record['cols_in']} → {record['cols_out']}"]
+            if self.memory:
+                row += [f"{record['bytes_allocated'] / 1024 ** 2:.1f}", record['copied_columns'],
+                        f"{record['copied_bytes'] / 1024 ** 2:.1f}"]
+            table.append(row)
+        return table
+
 from tabulate import tabulate
-import time
 
 class DataPreprocessor:
-    def __init__(self, df, config=None, problem_type='regression', auto_clean=False):
-        self.df = df.copy()
+    def __init__(self, df, config=None, problem_type='regression', auto_clean=False, inplace=False, verbose=True,
+                 fuse=False, cache=None, dtype=None):
+        # With inplace=True the caller's frame becomes the working buffer: handlers
+        # write into it directly and no copy of the dataset is ever taken.
+        self.df = df if inplace else df.copy()
         self.config = config
         self.problem_type = problem_type
         self.auto_clean = auto_clean
+        self.inplace = inplace
+        self.verbose = verbose
+        self.fuse = fuse
+        # dtype='float32' halves the memory of every float column; see check_float32_precision.
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        # A PreprocessingCache or a cache directory; hits skip fitting entirely.
+        self.cache = PreprocessingCache(cache) if isinstance(cache, (str, Path)) else cache
         self.preprocessing_report = {}
+        self._dataset_info = None
         
         self.missing_handler = None
         self.outlier_handler = None
@@ -382,6 +1799,8 @@ class DataPreprocessor:
         self.scaler = None
         self.skewness_handler = None
         self.imbalance_handler = None
+        self.plan = None
+        self.profiler = None
     
     def auto_preprocessing(self):
         try:
@@ -404,71 +1823,214 @@ class DataPreprocessor:
         if self.config is None:
             raise ValueError("Config must be provided for manual preprocessing")
         
-        self.df_processed = self.df.copy()
+        cache_key = None
+        if self.cache is not None:
+            # Profiling options do not change the output, so they stay out of the key.
+            cache_config = {key: value for key, value in self.config.items() if key != 'profiling'}
+            cache_key = self.cache.key(self.df, cache_config, target_column=target_column,
+                                       problem_type=self.problem_type, fuse=self.fuse, dtype=str(self.dtype))
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                self.profiler = None
+                self._restore_from_cache(entry)
+                self.preprocessing_report['cache'] = {'key': cache_key, 'hit': True, **self.cache.stats()}
+                runtime = time.time() - start_time
+                if self.verbose:
+                    self._print_dataset_info(runtime, self.df.shape)
+                return self.df_processed, runtime
+        
+        if self.dtype == np.float32:
+            self.preprocessing_report['dtype'] = check_float32_precision(self.df)
+        self.df_processed = cast_floats(self.df, self.dtype, copy=not self.inplace)
         original_shape = self.df_processed.shape
+        before_table = None
+        if self.inplace and self.verbose:
+            before_table = self._summary_table(self.df, "BEFORE PROCESSING")
+        self._dataset_info = None
         
         target_data = None
         if target_column and target_column in self.df_processed.columns:
             target_data = self.df_processed[target_column]
         
-        if 'imputation' in self.config:
-            self.missing_handler = MissingValueHandler(self.config['imputation'])
-            self.df_processed = self.missing_handler.fit_transform(self.df_processed, target_data, self.problem_type)
+        profiling = self.config.get('profiling', {})
+        self.profiler = StageProfiler(memory=profiling.get('memory', False), profiler=profiling.get('profiler'),
+                                      top=profiling.get('top', 20))
+        
+        config = self.config
+        if self.fuse:
+            self.plan = PreprocessingPlan(self.config, target_column, dtype=self.dtype)
+            self.df_processed = self.profiler.run('fused_plan', self.plan.fit_transform, self.df_processed)
+            config = self.plan.residual_config
         
-        if 'outlier' in self.config:
-            outlier_config = self.config['outlier']
+        if 'imputation' in config:
+            self.missing_handler = MissingValueHandler(config['imputation'], copy=False, dtype=self.dtype)
+            self.df_processed = self.profiler.run('imputation', self.missing_handler.fit_transform, self.df_processed,
+                                                  target_data, self.problem_type, handler=self.missing_handler)
+        
+        if 'outlier' in config:
+            outlier_config = config['outlier']
             self.outlier_handler = OutlierHandler(
                 method=outlier_config.get('method', 'zscore'),
                 threshold=outlier_config.get('threshold', 3),
                 action=outlier_config.get('action', 'cap'),
                 columns=outlier_config.get('columns'),
                 percentile_low=outlier_config.get('percentile_low', 0.05),
-                percentile_high=outlier_config.get('percentile_high', 0.95)
+                percentile_high=outlier_config.get('percentile_high', 0.95),
+                approximate=outlier_config.get('approximate', False),
+                sketch_size=outlier_config.get('sketch_size', 200),
+                copy=False,
+                dtype=self.dtype
             )
-            self.df_processed = self.outlier_handler.fit_transform(self.df_processed)
+            self.df_processed = self.profiler.run('outlier', self.outlier_handler.fit_transform, self.df_processed,
+                                                  handler=self.outlier_handler)
         
-        if 'rare_category' in self.config:
-            rare_config = self.config['rare_category']
+        if 'rare_category' in config:
+            rare_config = config['rare_category']
             self.rare_handler = RareCategoryHandler(
                 columns=rare_config.get('columns'),
                 threshold=rare_config.get('threshold', 0.01),
-                replacement=rare_config.get('replacement', 'Other')
+                replacement=rare_config.get('replacement', 'Other'),
+                copy=False
             )
-            self.df_processed = self.rare_handler.fit_transform(self.df_processed)
+            self.df_processed = self.profiler.run('rare_category', self.rare_handler.fit_transform, self.df_processed)
         
-        if 'skewness' in self.config:
-            skew_config = self.config['skewness']
+        if 'skewness' in config:
+            skew_config = config['skewness']
             self.skewness_handler = SkewnessHandler(
                 method=skew_config.get('method', 'log'),
                 columns=skew_config.get('columns'),
-                threshold=skew_config.get('threshold', 0.5)
+                threshold=skew_config.get('threshold', 0.5),
+                n_jobs=skew_config.get('n_jobs', 1),
+                sample_size=skew_config.get('sample_size'),
+                copy=False,
+                dtype=self.dtype
             )
-            self.df_processed = self.skewness_handler.fit_transform(self.df_processed)
+            self.df_processed = self.profiler.run('skewness', self.skewness_handler.fit_transform, self.df_processed,
+                                                  handler=self.skewness_handler)
         
-        if 'encoding' in self.config:
-            self.encoder = CategoricalEncoder(self.config['encoding'])
-            self.df_processed = self.encoder.fit_transform(self.df_processed, target_data)
+        if 'encoding' in config:
+            self.encoder = CategoricalEncoder(config['encoding'], copy=False, dtype=self.dtype)
+            self.df_processed = self.profiler.run('encoding', self.encoder.fit_transform, self.df_processed, target_data,
+                                                  handler=self.encoder)
         
-        if 'scaling' in self.config:
-            self.scaler = FeatureScaler(self.config['scaling'])
-            self.df_processed = self.scaler.fit_transform(self.df_processed)
+        if 'scaling' in config:
+            self.scaler = FeatureScaler(config['scaling'], copy=False, dtype=self.dtype)
+            self.df_processed = self.profiler.run('scaling', self.scaler.fit_transform, self.df_processed,
+                                                  handler=self.scaler)
         
-        if 'class_imbalance' in self.config and target_column and self.problem_type == 'classification':
-            imbalance_config = self.config['class_imbalance']
+        if 'class_imbalance' in config and target_column and self.problem_type == 'classification':
+            imbalance_config = config['class_imbalance']
             self.imbalance_handler = ClassImbalanceHandler(
                 method=imbalance_config.get('method', 'smote'),
-                k_neighbors=imbalance_config.get('k_neighbors', 5)
+                k_neighbors=imbalance_config.get('k_neighbors', 5),
+                sampling_strategy=imbalance_config.get('sampling_strategy', 'auto'),
+                n_jobs=imbalance_config.get('n_jobs', 1),
+                chunk_size=imbalance_config.get('chunk_size'),
+                dtype=self.dtype
             )
-            features = self.df_processed.drop(columns=[target_column])
-            target = self.df_processed[target_column]
-            resampled_features, resampled_target = self.imbalance_handler.fit_resample(features, target)
-            self.df_processed = pd.concat([resampled_features, resampled_target], axis=1)
+            self.df_processed = self.profiler.run('class_imbalance', self._balance_classes, self.df_processed,
+                                                  target_column, imbalance_config.get('append_only', False))
+        
+        self.preprocessing_report['stages'] = self.profiler.stages
+        
+        if self.cache is not None:
+            self._store_in_cache(cache_key, config, target_column)
+            self.preprocessing_report['cache'] = {'key': cache_key, 'hit': False, **self.cache.stats()}
         
         runtime = time.time() - start_time
-        self._print_dataset_info(runtime, original_shape)
+        if self.verbose:
+            self._print_dataset_info(runtime, original_shape, before_table)
         return self.df_processed, runtime
     
-    def _print_dataset_info(self, runtime, original_shape):
+    def _balance_classes(self, df, target_column, append_only):
+        features = df.drop(columns=[target_column])
+        target = df[target_column]
+        if append_only and self.imbalance_handler.method == 'smote':
+            synthetic_features, synthetic_target = self.imbalance_handler.generate_synthetic(features, target)
+            synthetic_df = pd.DataFrame(synthetic_features, columns=features.columns, copy=False)
+            synthetic_df = synthetic_df.astype(features.dtypes.to_dict())
+            synthetic_df[target_column] = synthetic_target
+            return pd.concat([df, synthetic_df[df.columns]], ignore_index=True)
+        resampled_features, resampled_target = self.imbalance_handler.fit_resample(features, target)
+        return pd.concat([resampled_features, resampled_target], axis=1)
+    
+    def _store_in_cache(self, cache_key, config, target_column):
+        entry = {'handlers': {name: getattr(self, name) for name in PreprocessingCache.HANDLERS}}
+        if self.cache.store_output:
+            entry['output'] = self.df_processed
+        else:
+            # Without the output a hit replays transform(), which cannot redo row
+            # removal or resampling, so such runs are not cached.
+            outlier_config = config.get('outlier') or {}
+            resampled = ('class_imbalance' in config and target_column and self.problem_type == 'classification')
+            if resampled or outlier_config.get('action') == 'remove':
+                return
+        self.cache.put(cache_key, entry)
+    
+    def _restore_from_cache(self, entry):
+        for name, handler in entry['handlers'].items():
+            setattr(self, name, handler)
+        self._dataset_info = None
+        if 'output' in entry:
+            self.df_processed = entry['output']
+        else:
+            self.df_processed = self.transform(self.df)
+    
+    def _fitted_handlers(self):
+        handlers = [self.plan, self.missing_handler, self.outlier_handler, self.rare_handler,
+                    self.skewness_handler, self.encoder, self.scaler]
+        return [handler for handler in handlers if handler is not None]
+    
+    def transform(self, df, n_jobs=1, partition_rows=None):
+        # Replays the fitted handlers on new data, e.g. for batch scoring. Class
+        # imbalance handling only applies while fitting. With n_jobs != 1 the rows
+        # are split into partitions and transformed in a process pool.
+        handlers = self._fitted_handlers()
+        row_dependent = ('forward_fill', 'backward_fill', 'interpolate')
+        if self.missing_handler is not None and any(self.missing_handler.strategy_config.get(key)
+                                                    for key in row_dependent):
+            # Fills that look at neighbouring rows would change at partition edges.
+            n_jobs = 1
+        
+        if n_jobs == 1 or len(df) == 0:
+            df_transformed = cast_floats(df, self.dtype, copy=True)
+            for handler in handlers:
+                df_transformed = handler.transform(df_transformed)
+            return df_transformed
+        return parallel_transform(handlers, df, n_jobs=n_jobs, partition_rows=partition_rows, dtype=self.dtype)
+    
+    def _summary_table(self, df, title):
+        numeric = df.select_dtypes(include=[np.number])
+        mean, std = numeric.mean(), numeric.std()
+        has_outliers = (numeric.max() > mean + 3 * std) | (numeric.min() < mean - 3 * std)
+        nunique = df.nunique()
+        
+        # One correlation matrix per frame; each pair is reported once from the upper triangle.
+        corr = np.abs(numeric.corr().to_numpy())
+        rows, cols = np.nonzero(np.triu(corr > 0.9, k=1))
+        correlated_pairs = [(numeric.columns[i], numeric.columns[j]) for i, j in zip(rows, cols)]
+        
+        table = [[title, "INFO"]]
+        table.append(["Shape", df.shape])
+        table.append(["Missing Values", df.isnull().sum().sum()])
+        table.append(["Duplicate Rows", df.duplicated().sum()])
+        table.append(["Numerical Columns", list(numeric.columns)])
+        table.append(["Categorical Columns", list(df.select_dtypes(include=['object', 'category']).columns)])
+        table.append(["Constant/Quasi-Constant Columns", list(nunique[nunique <= 1].index)])
+        table.append(["Outlier Columns", list(has_outliers[has_outliers].index)])
+        table.append(["Highly Correlated Columns", correlated_pairs])
+        return table
+    
+    def get_dataset_info(self):
+        if self._dataset_info is None:
+            before = None if self.inplace else self._summary_table(self.df, "BEFORE PROCESSING")
+            self._dataset_info = {
+                'before': before,
+                'after': self._summary_table(self.df_processed, "AFTER PROCESSING")
+            }
+        return self._dataset_info
+    
+    def _print_dataset_info(self, runtime, original_shape, before_table=None):
         print("🔄 Loading data...")
         print(f"✅ Successfully loaded {original_shape[0]} rows and {original_shape[1]} columns")
         print("✅ Data Preprocessing completed successfully!\n")
@@ -481,25 +2043,9 @@ class DataPreprocessor:
         print(f"Total Columns: {self.df_processed.shape[1]:,}")
         print(f"Runtime: {runtime/60:.0f} min {runtime%60:.2f} sec\n")
         
-        before_table = [["BEFORE PROCESSING", "INFO"]]
-        before_table.append(["Shape", original_shape])
-        before_table.append(["Missing Values", self.df.isnull().sum().sum()])
-        before_table.append(["Duplicate Rows", self.df.duplicated().sum()])
-        before_table.append(["Numerical Columns", list(self.df.select_dtypes(include=[np.number]).columns)])
-        before_table.append(["Categorical Columns", list(self.df.select_dtypes(include=['object', 'category']).columns)])
-        before_table.append(["Constant/Quasi-Constant Columns", [col for col in self.df.columns if self.df[col].nunique() <= 1]])
-        before_table.append(["Outlier Columns", [col for col in self.df.select_dtypes(include=[np.number]).columns if ((self.df[col] > (self.df[col].mean() + 3*self.df[col].std())) | (self.df[col] < (self.df[col].mean() - 3*self.df[col].std()))).any()]])
-        before_table.append(["Highly Correlated Columns", [(col1, col2) for col1 in self.df.corr().columns for col2 in self.df.corr().columns if col1 != col2 and abs(self.df.corr().loc[col1, col2]) > 0.9]])
-        
-        after_table = [["AFTER PROCESSING", "INFO"]]
-        after_table.append(["Shape", self.df_processed.shape])
-        after_table.append(["Missing Values", self.df_processed.isnull().sum().sum()])
-        after_table.append(["Duplicate Rows", self.df_processed.duplicated().sum()])
-        after_table.append(["Numerical Columns", list(self.df_processed.select_dtypes(include=[np.number]).columns)])
-        after_table.append(["Categorical Columns", list(self.df_processed.select_dtypes(include=['object', 'category']).columns)])
-        after_table.append(["Constant/Quasi-Constant Columns", [col for col in self.df_processed.columns if self.df_processed[col].nunique() <= 1]])
-        after_table.append(["Outlier Columns", [col for col in self.df_processed.select_dtypes(include=[np.number]).columns if ((self.df_processed[col] > (self.df_processed[col].mean() + 3*self.df_processed[col].std())) | (self.df_processed[col] < (self.df_processed[col].mean() - 3*self.df_processed[col].std()))).any()]])
-        after_table.append(["Highly Correlated Columns", [(col1, col2) for col1 in self.df_processed.corr().columns for col2 in self.df_processed.corr().columns if col1 != col2 and abs(self.df_processed.corr().loc[col1, col2]) > 0.9]])
+        info = self.get_dataset_info()
+        before_table = before_table or info['before']
+        after_table = info['after']
         
         print(get_line(" Pre-Process Information ","-"))
         print("\n")
@@ -509,6 +2055,11 @@ class DataPreprocessor:
         print("\n")
         print(tabulate(after_table, headers="firstrow", tablefmt="fancy_grid"))
         print("\n\n")
+        if self.profiler is not None and self.profiler.stages:
+            print(get_line(" Stage Profile ","-"))
+            print("\n")
+            print(tabulate(self.profiler.table(), headers="firstrow", tablefmt="fancy_grid"))
+            print("\n\n")
         print(get_line(" Processed Data ","-"))
         print("\n")
         print(f"{self.df_processed.head(5)}")
@@ -517,6 +2068,144 @@ class DataPreprocessor:
     def get_processed_data(self):
         return self.df_processed
 
+class ChunkedPreprocessor:
+    # Out-of-core counterpart of DataPreprocessor. Every stage is fitted in its
+    # own pass over the chunk source, with the stages before it already applied,
+    # and keeps only mergeable statistics (sums, moments, category counts and
+    # quantile sketches), so memory depends on the chunk size and the number of
+    # categories but never on the number of rows. A final pass streams the
+    # chunks through the fitted stages into a Parquet file.
+    #
+    # `chunks` has to be readable more than once: a list of frames or a callable
+    # returning a fresh iterator, e.g. lambda: pd.read_csv(path, chunksize=100_000).
+    def __init__(self, config, target_column=None, sketch_size=200, dtype=None):
+        self.config = config
+        self.target_column = target_column
+        self.sketch_size = sketch_size
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.stages = []
+        self.preprocessing_report = {}
+    
+    def _iter_chunks(self, chunks):
+        if callable(chunks):
+            return iter(chunks())
+        if iter(chunks) is chunks:
+            raise TypeError("chunks must be re-iterable: pass a list or a callable returning a new iterator")
+        return iter(chunks)
+    
+    def _build_stages(self):
+        config = self.config
+        stages = []
+        
+        if 'imputation' in config:
+            stages.append(('imputation', MissingValueHandler(config['imputation'], copy=False, dtype=self.dtype)))
+        
+        if 'outlier' in config:
+            outlier_config = config['outlier']
+            if outlier_config.get('action', 'cap') == 'remove':
+                raise ValueError("Outlier removal is not supported for chunked preprocessing; use action='cap'")
+            stages.append(('outlier', OutlierHandler(
+                method=outlier_config.get('method', 'zscore'),
+                threshold=outlier_config.get('threshold', 3),
+                action=outlier_config.get('action', 'cap'),
+                columns=outlier_config.get('columns'),
+                percentile_low=outlier_config.get('percentile_low', 0.05),
+                percentile_high=outlier_config.get('percentile_high', 0.95),
+                approximate=True,
+                sketch_size=outlier_config.get('sketch_size', self.sketch_size),
+                copy=False,
+                dtype=self.dtype
+            )))
+        
+        if 'rare_category' in config:
+            rare_config = config['rare_category']
+            stages.append(('rare_category', RareCategoryHandler(
+                columns=rare_config.get('columns'),
+                threshold=rare_config.get('threshold', 0.01),
+                replacement=rare_config.get('replacement', 'Other'),
+                copy=False
+            )))
+        
+        if 'skewness' in config:
+            skew_config = config['skewness']
+            stages.append(('skewness', SkewnessHandler(
+                method=skew_config.get('method', 'log'),
+                columns=skew_config.get('columns'),
+                threshold=skew_config.get('threshold', 0.5),
+                n_jobs=skew_config.get('n_jobs', 1),
+                sample_size=skew_config.get('sample_size'),
+                copy=False,
+                dtype=self.dtype
+            )))
+        
+        if 'encoding' in config:
+            stages.append(('encoding', CategoricalEncoder(config['encoding'], copy=False, dtype=self.dtype)))
+        
+        if 'scaling' in config:
+            stages.append(('scaling', FeatureScaler(config['scaling'], copy=False, dtype=self.dtype)))
+        
+        if 'class_imbalance' in config:
+            self.preprocessing_report['class_imbalance'] = 'Skipped: resampling needs the full dataset in memory'
+        return stages
+    
+    def fit(self, chunks):
+        self.stages = []
+        self.preprocessing_report['passes'] = 0
+        
+        for name, handler in self._build_stages():
+            for chunk in self._iter_chunks(chunks):
+                chunk = self._apply_stages(chunk)
+                if name == 'encoding':
+                    target = chunk[self.target_column] if self.target_column in chunk.columns else None
+                    handler.partial_fit(chunk, target)
+                else:
+                    handler.partial_fit(chunk)
+            if name == 'skewness':
+                handler.finalize()
+            self.stages.append((name, handler))
+            self.preprocessing_report['passes'] += 1
+        
+        return self
+    
+    def _apply_stages(self, chunk):
+        # One copy per chunk; the copy=False handlers then write into it.
+        chunk = cast_floats(chunk, self.dtype, copy=True)
+        for _, handler in self.stages:
+            chunk = handler.transform(chunk)
+        return chunk
+    
+    def transform(self, chunk):
+        return self._apply_stages(chunk)
+    
+    def transform_to_parquet(self, chunks, path, compression='snappy'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet output. Please install it using: pip install pyarrow")
+        
+        writer = None
+        n_rows = 0
+        try:
+            for chunk in self._iter_chunks(chunks):
+                table = pa.Table.from_pandas(self.transform(chunk), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression=compression)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                n_rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        self.preprocessing_report['passes'] = self.preprocessing_report.get('passes', 0) + 1
+        self.preprocessing_report['rows_written'] = n_rows
+        return n_rows
+    
+    def fit_transform_to_parquet(self, chunks, path, compression='snappy'):
+        return self.fit(chunks).transform_to_parquet(chunks, path, compression=compression)
+
 
 
 
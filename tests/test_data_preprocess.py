@@ -0,0 +1,134 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from imblearn.combine import SMOTEENN, SMOTETomek
+from imblearn.over_sampling import SMOTE
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "preprocess"))
+
+from data_preprocess import ClassImbalanceHandler, DataPreprocessor, PreprocessingPlan, StageProfiler
+
+
+def make_imbalanced(n_majority=204, n_minority=50, seed=0):
+    rng = np.random.default_rng(seed)
+    n = n_majority + n_minority
+    X = pd.DataFrame({
+        "value": rng.normal(size=n),
+        "count": rng.integers(0, 100, n),
+        "code": rng.integers(0, 4, n).astype(np.int8),
+    })
+    y = pd.Series([0] * n_majority + [1] * n_minority, name="target")
+    return X, y
+
+
+@pytest.mark.parametrize("sampling_strategy", ["auto", "minority", "not majority", 0.6, {1: 120}])
+def test_chunked_smote_matches_imblearn(sampling_strategy):
+    X, y = make_imbalanced()
+    expected_X, expected_y = SMOTE(sampling_strategy=sampling_strategy, random_state=42).fit_resample(X, y)
+    handler = ClassImbalanceHandler("smote", sampling_strategy=sampling_strategy, chunk_size=16)
+    X_resampled, y_resampled = handler.fit_resample(X, y)
+    
+    assert y_resampled.value_counts().to_dict() == expected_y.value_counts().to_dict()
+    assert X_resampled.dtypes.to_dict() == expected_X.dtypes.to_dict()
+    pd.testing.assert_frame_equal(X_resampled.iloc[:len(X)], X)
+
+
+@pytest.mark.parametrize("method, sampler", [("smote", SMOTE), ("smote_tomek", SMOTETomek), ("smote_enn", SMOTEENN)])
+@pytest.mark.parametrize("sampling_strategy", ["auto", 0.4, {1: 120}])
+def test_sampling_strategy_reaches_every_smote_method(method, sampler, sampling_strategy):
+    X, y = make_imbalanced()
+    _, expected_y = sampler(sampling_strategy=sampling_strategy, random_state=42).fit_resample(X, y)
+    _, y_resampled = ClassImbalanceHandler(method, sampling_strategy=sampling_strategy).fit_resample(X, y)
+    
+    assert pd.Series(y_resampled).value_counts().to_dict() == pd.Series(expected_y).value_counts().to_dict()
+
+
+def test_chunked_smote_rejects_unsupported_strategy():
+    X, y = make_imbalanced()
+    with pytest.raises(ValueError):
+        ClassImbalanceHandler("smote", sampling_strategy="most", chunk_size=16).fit_resample(X, y)
+
+
+def test_append_only_smote_keeps_dtypes():
+    X, y = make_imbalanced()
+    df = X.assign(target=y)
+    config = {"class_imbalance": {"method": "smote", "append_only": True, "sampling_strategy": 0.6}}
+    processed, _ = DataPreprocessor(df, config, problem_type="classification", verbose=False).preprocess("target")
+    
+    assert processed["target"].value_counts().to_dict() == {0: 204, 1: 122}
+    assert processed.dtypes.to_dict() == df.dtypes.to_dict()
+
+
+def test_float32_chunked_smote_keeps_integer_columns():
+    X, y = make_imbalanced()
+    X["id"] = np.arange(len(X), dtype=np.int64) + 2 ** 40
+    X["grade"] = np.array(list("abcde"))[X["count"].to_numpy() % 5]
+    df = X.assign(target=y)
+    config = {"encoding": {"binary": ["grade"]}, "class_imbalance": {"method": "smote", "chunk_size": 16}}
+    processed, _ = DataPreprocessor(df, config, problem_type="classification", verbose=False,
+                                    dtype="float32").preprocess("target")
+    
+    kept = ["count", "code", "id", "target"]
+    bits = [col for col in processed.columns if col.startswith("grade_bit_")]
+    assert processed["value"].dtype == np.float32
+    assert len(bits) == 3 and (processed[bits].dtypes == np.uint8).all()
+    assert processed[kept].dtypes.to_dict() == df[kept].dtypes.to_dict()
+    pd.testing.assert_frame_equal(processed.iloc[:len(df)][kept], df[kept])
+
+
+def make_skewed(n_rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f"num_{i}": rng.lognormal(sigma=1 + i / 4, size=n_rows) for i in range(6)})
+    df = df.mask(rng.random(df.shape) < 0.05)
+    df["target"] = rng.integers(0, 2, n_rows)
+    return df
+
+
+@pytest.mark.parametrize("skew_method", ["log", "boxcox", "yeo_johnson"])
+def test_fused_plan_matches_staged(skew_method):
+    df = make_skewed()
+    numeric = [f"num_{i}" for i in range(6)]
+    config = {
+        "imputation": {"mean": numeric[:3], "median": numeric[3:]},
+        "outlier": {"method": "iqr", "action": "cap", "columns": numeric},
+        "skewness": {"method": skew_method, "columns": numeric, "threshold": 0.5},
+        "scaling": {"standard": numeric[0::3], "minmax": numeric[1::3], "robust": numeric[2::3]},
+    }
+    staged, _ = DataPreprocessor(df, config, problem_type="classification", verbose=False).preprocess("target")
+    fused_preprocessor = DataPreprocessor(df, config, problem_type="classification", verbose=False, fuse=True)
+    fused, _ = fused_preprocessor.preprocess("target")
+    assert set(col for cols in fused_preprocessor.plan.groups.values() for col in cols) == set(numeric)
+    np.testing.assert_allclose(fused[numeric].to_numpy(), staged[numeric].to_numpy(), rtol=1e-7, atol=1e-9)
+    
+    # transform() runs the fitted chains as one numexpr expression per group, or step
+    # by step with numpy when numexpr is not used.
+    for use_numexpr in (True, False):
+        plan = PreprocessingPlan(config, "target", use_numexpr=use_numexpr)
+        fitted = plan.fit_transform(df.copy())
+        assert (plan._numexpr is not None) == use_numexpr
+        np.testing.assert_allclose(fitted[numeric].to_numpy(), staged[numeric].to_numpy(), rtol=1e-7, atol=1e-9)
+        transformed = plan.transform(df.copy())
+        np.testing.assert_allclose(transformed[numeric].to_numpy(), staged[numeric].to_numpy(), rtol=1e-7, atol=1e-9)
+
+
+def test_stage_profiler_counts_copies_at_the_stage_boundary():
+    X, _ = make_imbalanced()
+    X["label"] = pd.Categorical(np.where(X["count"] > 50, "high", "low"))
+    profiler = StageProfiler(memory=True)
+    copy_method = pd.DataFrame.copy
+    
+    def check_unpatched(df):
+        assert pd.DataFrame.copy is copy_method
+        return df
+    
+    profiler.run("identity", check_unpatched, X)
+    profiler.run("drop", lambda df: df.drop(columns=["code"]), X)
+    profiler.run("astype", lambda df: df.astype({"count": "float64", "code": "int16"}), X)
+    profiler.run("assign", lambda df: df.assign(extra=df["value"] * 2), X)
+    
+    copied = {record["stage"]: record["copied_columns"] for record in profiler.stages}
+    assert copied == {"identity": 0, "drop": 0, "astype": 2, "assign": 1}
+    assert profiler.stages[2]["copied_bytes"] == len(X) * (8 + 2)
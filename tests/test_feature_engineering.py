@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "feature"))
+
+from feature_engineering import AutoFeatureGenerator, DimensionalityReducer, FeatureCache, FeatureEngineer, FeatureSelector
+
+
+def make_frame(n_rows=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "age": rng.integers(29, 78, n_rows),
+        "trestbps": rng.integers(94, 200, n_rows),
+        "chol": rng.integers(126, 564, n_rows),
+        "thalach": rng.integers(71, 202, n_rows),
+        "ca": rng.integers(0, 5, n_rows),
+        "thal": rng.integers(0, 4, n_rows),
+        "oldpeak": rng.random(n_rows) * 6,
+    })
+    df["target"] = ((df["age"] > 55) ^ (df["thalach"] < 140)).astype(int)
+    return df
+
+
+def test_interactions_over_budget_are_reported(capsys):
+    df = make_frame()
+    generator = AutoFeatureGenerator("classification", memory_budget=4 * 8 * len(df))
+    assert generator.interaction_expressions(df, target_col="target") == []
+    assert "Skipping interaction features" in capsys.readouterr().out
+    
+    generator = AutoFeatureGenerator("classification", memory_budget=7 * 8 * len(df))
+    assert len(generator.interaction_expressions(df, max_interactions=20, target_col="target")) == 3
+    assert "limits interaction features to 3 of 20" in capsys.readouterr().out
+
+
+def test_cached_transform_sees_in_place_edits(tmp_path, capsys):
+    df = make_frame()
+    cached = FeatureEngineer(feature_type="auto", target_col="target", k_features=15, cache=tmp_path)
+    uncached = FeatureEngineer(feature_type="auto", target_col="target", k_features=15)
+    cached.run_pipeline(df)
+    uncached.run_pipeline(df)
+    
+    new = make_frame(seed=1)
+    before = cached.transform(new)
+    new["thal"] = new["thal"] + 1
+    new["ca"] *= 2
+    after = cached.transform(new)
+    
+    pd.testing.assert_frame_equal(after, uncached.transform(new))
+    assert not after.equals(before)
+
+
+def test_fractional_rfe_step_uses_remaining_features():
+    df = make_frame(300)
+    for col in range(10):
+        df[f"noise_{col}"] = np.random.default_rng(col).random(len(df))
+    selector = FeatureSelector("rfe", 5, "classification", step=0.3, n_jobs=1)
+    selector.select_features(df, "target")
+    
+    assert [h["n_features"] for h in selector.history] == [17, 12, 9, 7, 5]
+    assert len(selector.selected_features) == 5
+
+
+@pytest.mark.parametrize("sizes", [[3, 100, 100], [2, 2, 100, 1], [100, 3, 100, 4], [5, 5, 5, 5]])
+def test_incremental_fit_with_uneven_chunks(sizes):
+    df = make_frame(sum(sizes))
+    bounds = np.cumsum([0] + sizes)
+    chunks = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    reducer = DimensionalityReducer("incremental", n_components=5).fit(chunks, target_col="target")
+    
+    reduced = reducer.transform(df, target_col="target")
+    assert reducer.reducer.n_samples_seen_ == len(df)
+    assert list(reduced.columns) == [f"PC{i + 1}" for i in range(5)] + ["target"]
+
+
+def test_feature_cache_evicts_once_per_call(tmp_path, monkeypatch):
+    evictions = []
+    evict = FeatureCache.evict
+    monkeypatch.setattr(FeatureCache, "evict", lambda self: evictions.append(1) or evict(self))
+    cache = FeatureCache(tmp_path, max_bytes=8 * 1_000 * 5)
+    pipeline = FeatureEngineer(feature_type="auto", target_col="target", k_features=15, batch_size=8, cache=cache)
+    
+    pipeline.run_pipeline(make_frame())
+    assert len(evictions) == 1
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.npy")) <= cache.max_bytes
+    pipeline.transform(make_frame(seed=1))
+    assert len(evictions) == 2